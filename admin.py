@@ -0,0 +1,178 @@
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from datastore import make_backend, new_push_id
+from roster import normalize_data, record_items, build_summary, build_member_index
+from model import canonical_day, canonical_teams
+from validate import audit_months
+from lost_found import lost_item_list, build_lost_index, archive_batches
+
+# ==========================================
+# 🧰 관리 명령 (Streamlit 없이 실행)
+# ==========================================
+# 사용 예)
+#   python admin.py rebuild-summary                              # Firebase (service.json)
+#   python admin.py rebuild-summary --backend json --file local_db.json
+#   python admin.py rebuild-index
+#   python admin.py migrate-record-ids                           # 배열 모양의 날짜 기록을 push 키로 (한 번만)
+#   python admin.py migrate-schema                               # 기록/teams/월 규칙을 정식 모양으로 (한 번만)
+#   python admin.py migrate-lost-found                           # 배열 모양의 분실물을 push 키로 (한 번만)
+#   python admin.py rebuild-lost-index
+#   python admin.py archive-lost --days 90                       # 수령 후 90일 지난 분실물을 lost_archive 로
+#   python admin.py audit                                        # 전체 기록 충돌 점검 (같은 밤 당직 중복, 쉬는 날 연차 등)
+#   python admin.py publish-result --node monitor_result --data monitor.json   # 분석 결과 올리기 + version 올리기
+
+FIREBASE_DB_URL = 'https://ydcpmanager-default-rtdb.firebaseio.com/'
+
+
+def open_backend(args):
+    if args.backend == "firebase":
+        import firebase_admin
+        from firebase_admin import credentials
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app(credentials.Certificate(args.cred), {'databaseURL': args.db_url})
+    return make_backend(args.backend, args.file)
+
+
+# records 전체로 schedule/summary 를 다시 만든다. (합계가 어긋났을 때)
+def rebuild_summary(backend):
+    summary = build_summary(backend.get("schedule/records"))
+    backend.set("schedule/summary", summary)
+    return {"months": len(summary), "entries": sum(len(v) - 1 for v in summary.values())}
+
+
+# records 전체로 schedule/member_index 를 다시 만든다. (member_index_built 가 있어야 앱이 색인을 믿는다)
+def rebuild_index(backend):
+    index = build_member_index(backend.get("schedule/records"))
+    backend.update("schedule", {"member_index": index or None, "member_index_built": True})
+    return {"members": len(index), "entries": sum(len(v) for v in index.values())}
+
+
+# 배열 순번으로 저장된 기록(예전 모양, PC 프로그램 업로드)을 push 키로 옮긴다.
+# 날짜 노드를 통째로 다시 쓰므로 앱을 쓰지 않는 시간에 실행한다. 옮긴 뒤 색인도 새 id 로 다시 만든다.
+MIGRATE_BATCH_DAYS = 200
+
+def migrate_record_ids(backend):
+    records = normalize_data(backend.get("schedule/records"))
+    changes = {}
+    for d_key, raw in records.items():
+        items = record_items(raw)
+        if not any(rid.isdigit() for rid, _ in items): continue
+        changes[d_key] = {(new_push_id() if rid.isdigit() else rid): rec for rid, rec in items}
+    keys = sorted(changes)
+    for i in range(0, len(keys), MIGRATE_BATCH_DAYS):
+        backend.update("schedule/records", {k: changes[k] for k in keys[i:i + MIGRATE_BATCH_DAYS]})
+    return {"days": len(changes), **rebuild_index(backend)}
+
+
+# records/teams/month_rules 를 model.py 의 정식 모양으로 다시 쓴다. (migrate-record-ids 를 포함)
+# 기록은 push 키 + {name, type, val, hours} (다른 필드는 그대로), teams 는 이름 목록, 휴무 요일은 정수 목록.
+# 날짜 노드를 통째로 다시 쓰므로 앱을 쓰지 않는 시간에 실행하고, 끝나면 합계와 색인을 다시 만든다.
+def migrate_schema(backend):
+    records = normalize_data(backend.get("schedule/records"))
+    changes = {}
+    for d_key, raw in records.items():
+        day = canonical_day(raw, new_push_id)
+        if day != raw: changes[d_key] = day or None
+    keys = sorted(changes)
+    for i in range(0, len(keys), MIGRATE_BATCH_DAYS):
+        backend.update("schedule/records", {k: changes[k] for k in keys[i:i + MIGRATE_BATCH_DAYS]})
+
+    backend.set("schedule/teams", canonical_teams(backend.get("schedule/teams")))
+    rules = normalize_data(backend.get("schedule/month_rules"))
+    fixed = {}
+    for m_key, rule in rules.items():
+        if not isinstance(rule, dict): continue
+        offs = {k: sorted({int(x) for x in normalize_data(rule.get(k)).values() if str(x).isdigit()})
+                for k in ("t1_off", "t2_off")}
+        if any(offs[k] != rule.get(k, []) for k in offs): fixed[m_key] = {**rule, **offs}
+    if fixed: backend.update("schedule/month_rules", fixed)
+    return {"days": len(changes), "rules": len(fixed), **rebuild_summary(backend), **rebuild_index(backend)}
+
+
+# lost_found 전체로 lost_index (상태/날짜 색인, 보관중 개수) 를 다시 만든다.
+def rebuild_lost_index(backend):
+    index = build_lost_index(backend.get("lost_found"))
+    backend.set("lost_index", index)
+    return {"kept": len(index["kept"]), "returned": len(index["returned"])}
+
+
+# 배열로 저장된 분실물을 push 키로 옮긴다. 목록을 통째로 다시 쓰므로 앱을 쓰지 않는 시간에 실행한다.
+def migrate_lost_found(backend):
+    items = lost_item_list(backend.get("lost_found"))
+    moved = sum(1 for lid, _ in items if lid.isdigit())
+    if moved:
+        backend.set("lost_found", {(new_push_id() if lid.isdigit() else lid): item for lid, item in items})
+    return {"items": moved, **rebuild_lost_index(backend)}
+
+
+# 수령한 지 days 일이 지난 분실물을 lost_archive/{수령월} 로 옮긴다. (앱 사이드바 버튼과 같은 작업)
+def archive_lost(backend, days=90):
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    moved = 0
+    for changes in archive_batches(backend.get("lost_found"), cutoff):
+        backend.update("", changes)
+        moved += sum(1 for k in changes if k.startswith("lost_archive/"))
+    return {"archived": moved, "cutoff": cutoff}
+
+
+# 전체 기록을 월마다 근무표와 비추어 점검하고 문제를 출력한다.
+def audit_records(backend):
+    schedule = backend.get("schedule") or {}
+    records = normalize_data(schedule.get("records"))
+    if not records: return {"errors": 0, "warnings": 0}
+    sch = {**schedule, "records": records}
+    first, last = datetime.strptime(min(records), "%Y-%m-%d"), datetime.strptime(max(records), "%Y-%m-%d")
+    issues = audit_months(lambda y, m: sch, first, last)
+    for i in issues: print(f"[{i.level}] {i.date} {i.name}: {i.message}")
+    errors = sum(1 for i in issues if i.level == "error")
+    return {"errors": errors, "warnings": len(issues) - errors}
+
+
+# 분석 결과(monitor_result, stay_result)를 올리고 result_versions/{node} 의 version 을 올린다.
+# 앱은 version 만 주기적으로 읽다가 바뀌면 내용을 다시 받으므로, 내용을 먼저 쓰고 version 을 나중에 올린다.
+def publish_result(backend, node="monitor_result", data=None):
+    with open(data, encoding="utf-8") as f: payload = json.load(f)
+    backend.set(node, payload)
+    version, _ = backend.transaction(f"result_versions/{node}/version", lambda v: (v or 0) + 1)
+    updated_at = payload.get("updated_at") if isinstance(payload, dict) else None
+    backend.set(f"result_versions/{node}/updated_at", updated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    return {"node": node, "version": version}
+
+
+COMMANDS = {
+    "migrate-record-ids": migrate_record_ids,
+    "migrate-schema": migrate_schema,
+    "rebuild-summary": rebuild_summary,
+    "rebuild-index": rebuild_index,
+    "migrate-lost-found": migrate_lost_found,
+    "rebuild-lost-index": rebuild_lost_index,
+    "archive-lost": archive_lost,
+    "publish-result": publish_result,
+    "audit": audit_records,
+}
+COMMAND_OPTIONS = {"archive-lost": ["days"], "publish-result": ["node", "data"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="율동공원 모바일 데이터 관리 명령")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--backend", choices=["firebase", "json"], default="firebase")
+    parser.add_argument("--file", help="json 백엔드 파일 (기본 local_db.json)")
+    parser.add_argument("--cred", default="service.json", help="Firebase 서비스 계정 키 파일")
+    parser.add_argument("--db-url", default=FIREBASE_DB_URL)
+    parser.add_argument("--days", type=int, default=90, help="archive-lost: 수령 후 보관 처리까지 일수")
+    parser.add_argument("--node", default="monitor_result", choices=["monitor_result", "stay_result"], help="publish-result: 올릴 노드")
+    parser.add_argument("--data", help="publish-result: 올릴 내용 JSON 파일")
+    args = parser.parse_args(argv)
+
+    options = {k: getattr(args, k) for k in COMMAND_OPTIONS.get(args.command, [])}
+    result = COMMANDS[args.command](open_backend(args), **options)
+    print(f"{args.command}: {result}")
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() is not None else 1)
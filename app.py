@@ -1,824 +1,1185 @@
-import streamlit as st
-import firebase_admin
-from firebase_admin import credentials, db
-from datetime import datetime, timedelta
-import calendar
-import os
-import json
-import re
-
-# --- 기본 설정 ---
-CRED_FILENAME = "service.json" 
-FIREBASE_DB_URL = 'https://ydcpmanager-default-rtdb.firebaseio.com/'
-
-st.set_page_config(
-    page_title="율동공원 모바일", 
-    page_icon="⛺", 
-    layout="wide",
-    initial_sidebar_state="expanded"  # 사이드바 보이게 설정
-)
-
-# ==========================================
-# 🔐 로그인 시스템
-# ==========================================
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-
-def check_password():
-    if "PASSWORD" in st.secrets:
-        system_pass = st.secrets["PASSWORD"]
-    else:
-        system_pass = "0616"
-    
-    if st.session_state.password_input == system_pass:
-        st.session_state.logged_in = True
-    else:
-        st.error("비밀번호가 틀렸습니다.")
-
-if not st.session_state.logged_in:
-    st.markdown("## 🔒 관리자 로그인")
-    st.text_input("비밀번호를 입력하세요", type="password", key="password_input", on_change=check_password)
-    if st.button("로그인"):
-        check_password()
-    st.stop()
-
-# ==========================================
-# 🎨 UI 스타일 (모바일 최적화)
-# ==========================================
-st.markdown("""
-<style>
-    .stApp { font-family: 'Pretendard', 'Malgun Gothic', sans-serif; }
-    
-    /* 캘린더 컨테이너 */
-    .cal-container { 
-        display: flex; 
-        flex-direction: column; 
-        border: 1px solid #ddd; 
-        background-color: #fff; 
-        border-radius: 8px;
-        overflow: hidden; 
-    }
-    .cal-header-row { 
-        display: grid; 
-        grid-template-columns: repeat(7, 1fr); 
-        background-color: #f8f9fa; 
-        border-bottom: 1px solid #ddd; 
-    }
-    .cal-header-item { 
-        text-align: center; 
-        font-weight: bold; 
-        padding: 8px 0; 
-        font-size: 0.9rem; 
-        color: #495057; 
-    }
-    .cal-header-item:nth-child(6) { color: #1c7ed6; }
-    .cal-header-item:nth-child(7) { color: #e03131; }
-    
-    .cal-grid { 
-        display: grid; 
-        grid-template-columns: repeat(7, 1fr); 
-        background-color: #dee2e6; 
-        gap: 1px; 
-    }
-    .cal-cell { 
-        background-color: #ffffff; 
-        min-height: 60px; 
-        height: auto;
-        padding: 4px 2px; 
-        display: flex; 
-        flex-direction: column; 
-        gap: 2px;
-    }
-    .cal-cell.empty { background-color: #f8f9fa; min-height: 60px; }
-    
-    .date-num { 
-        font-size: 0.8rem; 
-        font-weight: bold; 
-        margin-bottom: 2px; 
-        padding-left: 4px; 
-        color: #333; 
-    }
-    .cal-cell:nth-child(7n-1) .date-num { color: #1c7ed6; }
-    .cal-cell:nth-child(7n) .date-num { color: #e03131; }
-
-    .work-box { 
-        font-size: 0.75rem; 
-        padding: 3px 4px; 
-        border-radius: 4px; 
-        line-height: 1.3; 
-        color: #333; 
-        font-weight: 500; 
-        word-break: keep-all; 
-        white-space: normal; 
-    }
-    .wb-a { background-color: #e7f5ff; border: 1px solid #d0ebff; color: #1864ab; }
-    .wb-b { background-color: #fff4e6; border: 1px solid #ffe8cc; color: #d9480f; }
-    .wb-rest { background-color: #ffe3e3; color: #c92a2a; text-align: center; }
-    
-    .badge { 
-        font-size: 0.7rem; 
-        padding: 3px 4px; 
-        border-radius: 4px; 
-        margin-top: 1px; 
-        color: white; 
-        display: block; 
-        white-space: normal; 
-        line-height: 1.2;
-    }
-    .bg-night { background-color: #D32F2F; } 
-    .bg-leave { background-color: #2E7D32; } 
-    .bg-ot { background-color: #1A237E; }    
-    .bg-gray { background-color: #868e96; }
-    
-    @media (max-width: 600px) { 
-        .cal-header-item { font-size: 0.7rem; padding: 4px 0; } 
-        .cal-cell { min-height: 50px; padding: 2px; } 
-        .date-num { font-size: 0.7rem; margin-bottom: 1px; } 
-        .work-box { font-size: 0.65rem; padding: 2px 3px; letter-spacing: -0.5px; } 
-        .badge { font-size: 0.65rem; padding: 2px 3px; letter-spacing: -0.5px; } 
-    }
-    
-    .stat-card { padding: 10px; border-radius: 8px; text-align: center; margin-bottom: 5px; }
-    .stat-blue { background-color: #e3f2fd; color: #1565c0; border: 1px solid #90caf9; }
-    .stat-green { background-color: #e8f5e9; color: #2e7d32; border: 1px solid #a5d6a7; }
-</style>
-""", unsafe_allow_html=True)
-
-# --- Firebase 초기화 ---
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-CRED_PATH = os.path.join(CURRENT_DIR, CRED_FILENAME)
-
-@st.cache_resource
-def init_firebase():
-    if firebase_admin._apps: return True
-    
-    if "firebase_key" in st.secrets:
-        try:
-            val = st.secrets["firebase_key"]
-            if isinstance(val, str): cred_info = json.loads(val)
-            else: cred_info = dict(val)
-            
-            if "private_key" in cred_info: 
-                cred_info["private_key"] = cred_info["private_key"].replace("\\n", "\n")
-            
-            cred = credentials.Certificate(cred_info)
-            firebase_admin.initialize_app(cred, {'databaseURL': FIREBASE_DB_URL})
-            return True
-        except Exception as e: st.error(f"Cloud 인증 오류: {e}"); return False
-    
-    if os.path.exists(CRED_PATH):
-        try:
-            cred = credentials.Certificate(CRED_PATH)
-            firebase_admin.initialize_app(cred, {'databaseURL': FIREBASE_DB_URL})
-            return True
-        except Exception as e: st.error(f"로컬 인증 오류: {e}"); return False
-    
-    st.warning("⚠️ 인증 파일을 찾을 수 없습니다.")
-    return False
-
-if not init_firebase(): st.stop()
-
-# --- DB 헬퍼 ---
-def get_data(path): return db.reference(f'yuldong_data/{path}').get()
-def set_data(path, data): db.reference(f'yuldong_data/{path}').set(data)
-def normalize_data(data):
-    if isinstance(data, list): return {str(i): v for i, v in enumerate(data) if v is not None}
-    return data if data else {}
-
-# --- [NEW] 사이드바 설정 (로드/저장 설명) ---
-with st.sidebar:
-    st.header("☁️ DB 동기화")
-    
-    # [Load 버튼]
-    if st.button("🔄 최신 데이터 불러오기 (Load)", use_container_width=True):
-        st.cache_resource.clear()
-        st.toast("☁️ 클라우드에서 최신 데이터를 불러왔습니다.")
-        st.rerun()
-    
-    st.info("""
-    **[저장(Save) 안내]**
-    
-    모바일 앱은 데이터 안전을 위해
-    **등록/삭제/수정 버튼 클릭 시**
-    **즉시 클라우드에 저장**됩니다.
-    
-    별도의 '전체 저장' 버튼은 없습니다.
-    """)
-    
-    if st.button("로그아웃", use_container_width=True):
-        st.session_state.logged_in = False
-        st.rerun()
-
-# --- 자동 근무자 계산 함수 ---
-def get_auto_duty_members(curr_date, sch_data):
-    records = normalize_data(sch_data.get("records", {}))
-    teams = normalize_data(sch_data.get("teams", {}))
-    month_rules = normalize_data(sch_data.get("month_rules", {}))
-    
-    t1_list = teams.get("1", [])
-    t2_list = teams.get("2", [])
-    if isinstance(t1_list, str): t1_list = [t1_list]
-    if isinstance(t2_list, str): t2_list = [t2_list]
-
-    year, month, day = curr_date.year, curr_date.month, curr_date.day
-    date_str = curr_date.strftime("%Y-%m-%d")
-    month_key = f"{year}-{month:02d}"
-    
-    rules = month_rules.get(month_key, {})
-    # 기본값 설정
-    start_team = rules.get("start_team", "1")
-    off1 = rules.get("t1_off", [4, 5]) 
-    off2 = rules.get("t2_off", [6, 0]) 
-
-    prev_str = (curr_date - timedelta(days=1)).strftime("%Y-%m-%d")
-    rest_members = []
-    
-    if prev_str in records:
-        prev_recs = records[prev_str]
-        if isinstance(prev_recs, dict): prev_recs = list(prev_recs.values())
-        elif isinstance(prev_recs, list): prev_recs = [x for x in prev_recs if x]
-        for r in prev_recs:
-            if isinstance(r, dict) and r.get('type') == '당직': 
-                rest_members.append(r.get('name'))
-    
-    if date_str in records:
-        today_recs = records[date_str]
-        if isinstance(today_recs, dict): today_recs = list(today_recs.values())
-        elif isinstance(today_recs, list): today_recs = [x for x in today_recs if x]
-        for r in today_recs:
-            if r.get('type') in ['당직휴무', '휴무']:
-                rest_members.append(r.get('name'))
-
-    t1_today = [m for m in t1_list if m not in rest_members]
-    t2_today = [m for m in t2_list if m not in rest_members]
-
-    cal = calendar.Calendar(firstweekday=0)
-    month_days = cal.monthdayscalendar(year, month)
-    
-    week_idx = 0
-    for idx, week in enumerate(month_days):
-        if day in week:
-            week_idx = idx
-            break
-            
-    weekday = curr_date.weekday()
-    is_t1_off = (weekday in off1)
-    is_t2_off = (weekday in off2)
-    
-    duty_list = []
-    
-    if not is_t1_off and not is_t2_off:
-        is_even_week = (week_idx % 2 == 0)
-        duty_list.extend(t1_today)
-        duty_list.extend(t2_today)
-    elif is_t1_off and not is_t2_off:
-        duty_list.extend(t2_today)
-    elif is_t2_off and not is_t1_off:
-        duty_list.extend(t1_today)
-        
-    return duty_list
-
-# --- [수정 완료] 달력 그리기 ---
-# --- [수정] 달력 그리기 (특별근무 통합 표시) ---
-def draw_calendar(year, month, sch_data, my_filter=None):
-    records = normalize_data(sch_data.get("records", {}))
-    teams = normalize_data(sch_data.get("teams", {}))
-    month_rules = normalize_data(sch_data.get("month_rules", {}))
-    
-    t1_list = teams.get("1", [])
-    t2_list = teams.get("2", [])
-    if isinstance(t1_list, str): t1_list = [t1_list]
-    if isinstance(t2_list, str): t2_list = [t2_list]
-
-    month_key = f"{year}-{month:02d}"
-    rules = month_rules.get(month_key, {})
-    
-    start_team = rules.get("start_team", "1")
-    time_type = rules.get("time_type", "split")
-    rotation_type = rules.get("rotation_type", "fixed")
-    
-    base_off1 = rules.get("t1_off", [])
-    base_off2 = rules.get("t2_off", [])
-    
-    t1_origin = t1_list
-    t2_origin = t2_list
-
-    html = '<div class="cal-container"><div class="cal-header-row">'
-    days = ['월', '화', '수', '목', '금', '토', '일']
-    for d in days: html += f'<div class="cal-header-item">{d}</div>'
-    html += '</div><div class="cal-grid">'
-    
-    cal = calendar.Calendar(firstweekday=0) 
-    month_days = cal.monthdayscalendar(year, month)
-    
-    for r_idx, week in enumerate(month_days):
-        # 1. 주차별 로테이션 상태 확인
-        if rotation_type == "biweekly" and (r_idx % 2 != 0):
-            # 격주 모드 & 홀수 주차 -> 반대로
-            curr_off1, curr_off2 = base_off2, base_off1
-        elif rotation_type == "two_weeks":
-            # 2주 단위 모드
-            rot_state = (r_idx // 2) % 2
-            if rot_state == 1: curr_off1, curr_off2 = base_off2, base_off1
-            else: curr_off1, curr_off2 = base_off1, base_off2
-        else:
-            # 고정 모드
-            curr_off1, curr_off2 = base_off1, base_off2
-
-        # 2. A조/B조 순서 결정 (누가 파란색/오전이고 누가 주황색/오후인지)
-        is_even_week = (r_idx % 2 == 0)
-        # start_team이 1이면 짝수주에 1조가 A(먼저)
-        is_t1_first = (start_team == "1") if is_even_week else (start_team == "2")
-
-        for c_idx, day in enumerate(week):
-            if day == 0:
-                html += '<div class="cal-cell empty"></div>'
-                continue
-            
-            curr_date = datetime(year, month, day)
-            date_str = f"{year}-{month:02d}-{day:02d}"
-            
-            # 기록 로드
-            today_recs_raw = records.get(date_str, [])
-            if isinstance(today_recs_raw, dict): today_recs = list(today_recs.values())
-            elif isinstance(today_recs_raw, list): today_recs = [x for x in today_recs_raw if x]
-            else: today_recs = []
-
-            off_names = set()
-            special_names = set()
-
-            for r in today_recs:
-                if r.get('type') in ['당직휴무', '휴무', '팀휴무']:
-                    off_names.add(r.get('name'))
-                elif r.get('type') == '특별근무':
-                    special_names.add(r.get('name'))
-
-            # 규칙상 근무 여부
-            is_t1_rule_work = (c_idx not in curr_off1)
-            is_t2_rule_work = (c_idx not in curr_off2)
-
-            # 최종 근무자 명단 (특별근무자 포함)
-            t1_today = []
-            for m in t1_list:
-                if (is_t1_rule_work and m not in off_names) or (m in special_names):
-                    t1_today.append(m)
-            
-            t2_today = []
-            for m in t2_list:
-                if (is_t2_rule_work and m not in off_names) or (m in special_names):
-                    t2_today.append(m)
-
-            t1_str = ", ".join(t1_today)
-            t2_str = ", ".join(t2_today)
-            
-            # --- 근무 박스 HTML 생성 ---
-            work_html = ""
-            
-            # (1) A조 (상단, 파란색 계열) 처리
-            team_a_list = t1_today if is_t1_first else t2_today
-            team_a_is_rule = is_t1_rule_work if is_t1_first else is_t2_rule_work
-            
-            if team_a_list:
-                # 시간 라벨 결정
-                if not team_a_is_rule: # 규칙상 휴무인데 나옴(특별근무)
-                    lbl = "[09-18]"
-                elif time_type == "unified": # 통합 근무 설정
-                    lbl = "[09-18]"
-                else: # 정규 A조 근무
-                    lbl = "[08-17]"
-                
-                work_html += f'<div class="work-box wb-a">{lbl} {", ".join(team_a_list)}</div>'
-
-            # (2) B조 (하단, 주황색 계열) 처리
-            team_b_list = t2_today if is_t1_first else t1_today
-            team_b_is_rule = is_t2_rule_work if is_t1_first else is_t1_rule_work
-            
-            if team_b_list:
-                # 시간 라벨 결정
-                if not team_b_is_rule: # 규칙상 휴무인데 나옴(특별근무)
-                    lbl = "[09-18]"
-                elif time_type == "unified": # 통합 근무 설정
-                    lbl = "[09-18]"
-                else: # 정규 B조 근무
-                    lbl = "[11-20]"
-                
-                work_html += f'<div class="work-box wb-b">{lbl} {", ".join(team_b_list)}</div>'
-
-            # (3) 근무자가 아무도 없으면 휴무 표시
-            if not team_a_list and not team_b_list:
-                 work_html += '<div class="work-box wb-rest">휴무</div>'
-
-            # --- 개인 일정 뱃지 (특별근무 제외) ---
-            indiv_html = ""
-            for evt in today_recs:
-                if not isinstance(evt, dict): continue
-                if my_filter and my_filter != "전체 보기" and evt.get('name') != my_filter: continue
-                e_type, e_name, e_val = evt.get('type',''), evt.get('name',''), evt.get('val','')
-                
-                # 표시하지 않을 타입들
-                if e_type in ["당직휴무", "휴무", "팀휴무"]: continue 
-                
-                # [핵심] 특별근무는 위에서 이미 박스에 넣었으므로 뱃지 생략
-                if e_type == "특별근무": continue 
-
-                bg_c, fg_c = "#eee", "black"
-                display_txt = f"{e_name} {e_type}"
-
-                if e_type == "당직": 
-                    bg_c, fg_c = "#D32F2F", "white"
-                    display_txt = f"{e_name} 당직"
-                elif e_type == "연차": 
-                    bg_c, fg_c = "#2E7D32", "white"
-                    if str(e_val).replace('.','').isdigit(): display_txt = f"{e_name} 연차 {e_val}h"
-                    else: display_txt = f"{e_name} 연차"
-                elif e_type == "시간외": 
-                    bg_c, fg_c = "#1A237E", "white"
-                    if str(e_val).replace('.','').isdigit(): display_txt = f"{e_name} 시간외 {e_val}h"
-                    else: display_txt = f"{e_name} 시간외 {e_val}"
-                
-                indiv_html += f'<div class="badge" style="background-color:{bg_c}; color:{fg_c};">{display_txt}</div>'
-
-            html += f'<div class="cal-cell"><div class="date-num">{day}</div>{work_html}{indiv_html}</div>'
-    html += '</div></div>'
-    st.markdown(html, unsafe_allow_html=True)
-
-# --- 메인 탭 구성 ---
-st.title("🏕️ 율동공원 관리 시스템")
-
-# 탭 5개
-tab_cal, tab_my, tab_stay, tab_mon, tab_lost = st.tabs(["📅 근무", "✍️ 수정", "⛺ 연박", "📊 현황", "🧢 분실"])
-
-# 1. 근무표 탭
-with tab_cal:
-    if 'curr_date' not in st.session_state: st.session_state.curr_date = datetime.now()
-    
-    # [월 이동 로직]
-    def change_month(amount):
-        curr = st.session_state.curr_date
-        new_year = curr.year
-        new_month = curr.month + amount
-        
-        if new_month > 12:
-            new_month = 1
-            new_year += 1
-        elif new_month < 1:
-            new_month = 12
-            new_year -= 1
-            
-        st.session_state.curr_date = curr.replace(year=new_year, month=new_month, day=1)
-    
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c1: st.button("◀", on_click=change_month, args=(-1,), use_container_width=True)
-    with c2: 
-        cur = st.session_state.curr_date
-        st.markdown(f"<h4 style='text-align:center; margin:0'>{cur.year}년 {cur.month}월</h4>", unsafe_allow_html=True)
-    with c3: st.button("▶", on_click=change_month, args=(1,), use_container_width=True)
-    
-    sch_data = get_data("schedule") or {}
-    teams = normalize_data(sch_data.get("teams", {}))
-    t1 = teams.get("1", [])
-    t2 = teams.get("2", [])
-    if isinstance(t1, str): t1 = [t1]
-    if isinstance(t2, str): t2 = [t2]
-    members = ["전체 보기"] + t1 + t2
-    
-    my_filter = st.selectbox("직원별 보기", members, label_visibility="collapsed")
-    draw_calendar(cur.year, cur.month, sch_data, my_filter)
-
-    st.divider()
-    with st.expander("🛠️ 날짜별 일정 관리 (삭제 및 휴무)", expanded=False):
-        st.caption("🚨 삭제 버튼을 누르면 내용이 일치하는 항목을 찾아 삭제하고 **즉시 저장(Save)**합니다.")
-        
-        del_date = st.date_input("관리할 날짜 선택", value=cur)
-        del_key = del_date.strftime("%Y-%m-%d")
-        
-        fresh_sch = get_data("schedule") or {}
-        if "records" not in fresh_sch: fresh_sch["records"] = {}
-        all_recs = normalize_data(fresh_sch["records"])
-        
-        target_list = all_recs.get(del_key, [])
-        if isinstance(target_list, dict): target_list = list(target_list.values())
-        elif isinstance(target_list, list): target_list = [x for x in target_list if x]
-
-        st.subheader("1️⃣ 등록된 일정 (삭제)")
-        
-        manual_exists = False
-        for i, rec in enumerate(target_list):
-            if rec.get('type') in ['휴무', '팀휴무', '당직휴무']: continue 
-            manual_exists = True
-            
-            with st.container(border=True):
-                cols = st.columns([4, 1])
-                icon = {"당직": "🌙", "연차": "🌴", "시간외": "⏰"}.get(rec['type'], "📝")
-                
-                with cols[0]:
-                    st.write(f"{icon} **{rec['name']}** {rec['type']} ({rec.get('val', '')})")
-                
-                with cols[1]:
-                    btn_key = f"del_{del_key}_{rec['name']}_{rec['type']}_{rec.get('val','')}_{i}"
-                    
-                    if st.button("삭제", key=btn_key, use_container_width=True):
-                        latest_recs_raw = get_data(f"schedule/records/{del_key}") or []
-                        
-                        if isinstance(latest_recs_raw, dict): latest_list = list(latest_recs_raw.values())
-                        elif isinstance(latest_recs_raw, list): latest_list = [x for x in latest_recs_raw if x]
-                        else: latest_list = []
-
-                        found_idx = -1
-                        for idx, item in enumerate(latest_list):
-                            if (item.get('name') == rec['name'] and 
-                                item.get('type') == rec['type'] and 
-                                str(item.get('val')) == str(rec.get('val'))):
-                                found_idx = idx
-                                break
-                        
-                        if found_idx != -1:
-                            del latest_list[found_idx]
-                            set_data(f"schedule/records/{del_key}", latest_list)
-                            st.toast("삭제 후 저장되었습니다.")
-                            st.rerun()
-                        else:
-                            st.error("이미 삭제되었거나 데이터가 변경되었습니다.")
-                            st.rerun()
-        
-        if not manual_exists:
-            st.caption("등록된 개인 일정이 없습니다.")
-
-        st.divider()
-        st.subheader("2️⃣ 자동 생성 근무자 (제외 처리)")
-        
-        auto_members = get_auto_duty_members(del_date, fresh_sch)
-        
-        if not auto_members:
-            st.caption("이 날은 근무자가 없습니다.")
-        else:
-            for mem in auto_members:
-                with st.container(border=True):
-                    c1, c2 = st.columns([4, 1])
-                    with c1: st.write(f"👷 **{mem}** (자동 배정)")
-                    with c2:
-                        if st.button("제외", key=f"excl_{del_key}_{mem}", use_container_width=True):
-                            latest_recs_raw = get_data(f"schedule/records/{del_key}") or []
-                            if isinstance(latest_recs_raw, dict): latest_list = list(latest_recs_raw.values())
-                            elif isinstance(latest_recs_raw, list): latest_list = [x for x in latest_recs_raw if x]
-                            else: latest_list = []
-                            
-                            latest_list.append({"type": "휴무", "name": mem, "val": "모바일제외"})
-                            
-                            set_data(f"schedule/records/{del_key}", latest_list)
-                            st.toast(f"{mem}님 제외 설정 저장됨.")
-                            st.rerun()
-                            
-        excluded_list = [r for r in target_list if r.get('type') == '휴무']
-        if excluded_list:
-            st.divider()
-            st.caption("🚫 현재 제외된 근무자")
-            for i, rec in enumerate(excluded_list):
-                with st.container(border=True):
-                    c1, c2 = st.columns([4, 1])
-                    with c1: st.write(f"❌ **{rec['name']}** (제외됨)")
-                    with c2:
-                        if st.button("복구", key=f"rest_{del_key}_{i}", use_container_width=True):
-                            latest_recs_raw = get_data(f"schedule/records/{del_key}") or []
-                            if isinstance(latest_recs_raw, dict): latest_list = list(latest_recs_raw.values())
-                            elif isinstance(latest_recs_raw, list): latest_list = [x for x in latest_recs_raw if x]
-                            else: latest_list = []
-                            
-                            found_idx = -1
-                            for idx, item in enumerate(latest_list):
-                                if item.get('type') == '휴무' and item.get('name') == rec['name']:
-                                    found_idx = idx
-                                    break
-                            
-                            if found_idx != -1:
-                                del latest_list[found_idx]
-                                set_data(f"schedule/records/{del_key}", latest_list)
-                                st.toast("복구되어 저장되었습니다.")
-                                st.rerun()
-
-# 2. 내 수정 탭
-with tab_my:
-    st.subheader("근무 기록 관리")
-    sel_name = st.selectbox("직원 선택", [m for m in members if m != "전체 보기"])
-    
-    if sel_name:
-        cur_y, cur_m = cur.year, cur.month
-        month_prefix = f"{cur_y}-{cur_m:02d}"
-        sch_data = get_data("schedule") or {}
-        all_recs = normalize_data(sch_data.get("records", {}))
-        
-        sum_ot, sum_leave, cnt_night = 0.0, 0.0, 0
-        for d_key, evts in all_recs.items():
-            if not d_key.startswith(month_prefix): continue
-            if isinstance(evts, dict): evts = list(evts.values())
-            elif isinstance(evts, list): evts = [x for x in evts if x]
-            for e in evts:
-                if isinstance(e, dict) and e.get('name') == sel_name:
-                    etype = e.get('type')
-                    eval_str = str(e.get('val', '0'))
-                    nums = re.findall(r"[-+]?\d*\.\d+|\d+", eval_str)
-                    val = float(nums[0]) if nums else 0.0
-                    if etype == '시간외': sum_ot += val
-                    elif etype == '연차': sum_leave += val
-                    elif etype == '당직': cnt_night += 1
-
-        st.markdown(f"##### 📊 {cur_y}년 {cur_m}월 {sel_name}님 합계")
-        c1, c2, c3 = st.columns(3)
-        c1.markdown(f"<div style='background:#E3F2FD;padding:10px;border-radius:5px;text-align:center;border:1px solid #90CAF9'><div style='font-size:0.8rem;color:#1565C0'>⏰ 시간외</div><div style='font-size:1.2rem;font-weight:bold;color:#0D47A1'>{sum_ot:g}H</div></div>", unsafe_allow_html=True)
-        c2.markdown(f"<div style='background:#E8F5E9;padding:10px;border-radius:5px;text-align:center;border:1px solid #A5D6A7'><div style='font-size:0.8rem;color:#2E7D32'>🌴 연차</div><div style='font-size:1.2rem;font-weight:bold;color:#1B5E20'>{sum_leave:g}H</div></div>", unsafe_allow_html=True)
-        c3.markdown(f"<div style='background:#FFEBEE;padding:10px;border-radius:5px;text-align:center;border:1px solid #FFCDD2'><div style='font-size:0.8rem;color:#C62828'>🌙 당직</div><div style='font-size:1.2rem;font-weight:bold;color:#B71C1C'>{cnt_night}회</div></div>", unsafe_allow_html=True)
-        
-        st.divider()
-        st.write("📝 **새로운 기록 추가** (저장 시 클라우드 반영)")
-        with st.form("new_schedule"):
-            c_d, c_t = st.columns(2)
-            in_date = c_d.date_input("날짜", value=datetime.now())
-            in_type = c_t.selectbox("구분", ["시간외", "당직", "연차"])
-            in_val = st.text_input("내용", placeholder="시간(4, 8) 또는 메모")
-            
-            if st.form_submit_button("저장하기", type="primary", use_container_width=True):
-                d_key = in_date.strftime("%Y-%m-%d")
-                day_data_raw = get_data(f"schedule/records/{d_key}") or []
-                
-                if isinstance(day_data_raw, dict): day_list = list(day_data_raw.values())
-                elif isinstance(day_data_raw, list): day_list = [x for x in day_data_raw if x]
-                else: day_list = []
-                
-                save_val = in_val
-                if in_type == "당직" and not in_val: save_val = "22:00~"
-                
-                day_list.append({"name": sel_name, "type": in_type, "val": save_val})
-                set_data(f"schedule/records/{d_key}", day_list)
-                
-                st.toast("클라우드에 저장되었습니다.")
-                st.rerun()
-
-        st.divider()
-        st.write("🗑️ **최근 기록 삭제**")
-        my_logs = []
-        for d_key, evts in all_recs.items():
-            if isinstance(evts, dict): evts = list(evts.values())
-            elif isinstance(evts, list): evts = [x for x in evts if x]
-            for e in evts:
-                if isinstance(e, dict) and e.get('name') == sel_name:
-                    temp_e = e.copy(); temp_e['date'] = d_key
-                    my_logs.append(temp_e)
-        my_logs.sort(key=lambda x: x['date'], reverse=True)
-
-        if not my_logs: st.info("기록이 없습니다.")
-        for i, log in enumerate(my_logs[:10]):
-            with st.container(border=True):
-                col_info, col_btn = st.columns([4, 1])
-                type_icon = {"시간외": "⏰", "당직": "🌙", "연차": "🌴"}.get(log['type'], "📝")
-                disp_text = f"{type_icon} {log['type']} | {log['val']}"
-                with col_info:
-                    st.write(f"**{log['date']}**")
-                    st.caption(disp_text)
-                with col_btn:
-                    unique_key = f"del_{log['date']}_{log['type']}_{log['val']}_{i}"
-                    if st.button("삭제", key=unique_key, use_container_width=True):
-                        latest_recs_raw = get_data(f"schedule/records/{log['date']}") or []
-                        
-                        if isinstance(latest_recs_raw, dict): latest_list = list(latest_recs_raw.values())
-                        elif isinstance(latest_recs_raw, list): latest_list = [x for x in latest_recs_raw if x]
-                        else: latest_list = []
-                        
-                        found_idx = -1
-                        for idx, item in enumerate(latest_list):
-                            if (item.get('name') == sel_name and 
-                                item.get('type') == log['type'] and 
-                                str(item.get('val')) == str(log['val'])):
-                                found_idx = idx
-                                break
-                        
-                        if found_idx != -1:
-                            del latest_list[found_idx]
-                            set_data(f"schedule/records/{log['date']}", latest_list)
-                            st.toast("삭제 후 클라우드 저장 완료.")
-                            st.rerun()
-                        else:
-                            st.warning("이미 삭제된 항목입니다.")
-                            st.rerun()
-
-# 3. 연박자 보기 탭
-with tab_stay:
-    st.subheader("⛺ 연박 및 이동 현황")
-    stay_data = get_data("stay_result")
-    if stay_data:
-        updated = stay_data.get("updated_at", "-")
-        st.info(f"🕒 업데이트: {updated}")
-        items = stay_data.get("list", [])
-        if not items: st.success("연박/이동 내역이 없습니다.")
-        else:
-            for item in items:
-                if "방이동" in item or "➡" in item: st.warning(item)
-                else: st.info(item)
-            st.caption("※ 데이터는 PC 프로그램에서 분석 후 자동 반영됩니다.")
-    else: st.warning("데이터가 없습니다. PC 프로그램에서 분석을 실행해주세요.")
-
-# 4. 입실 현황 탭
-with tab_mon:
-    st.subheader("📊 예약 및 입실 현황")
-    mon_data = get_data("monitor_result")
-    if mon_data:
-        updated = mon_data.get("updated_at", "-")
-        st.caption(f"🕒 기준: {updated}")
-        summ = mon_data.get("summary", {})
-        col1, col2, col3 = st.columns(3)
-        col1.metric("총 예약", f"{summ.get('total',0)}건")
-        col2.metric("입실(파랑)", f"{summ.get('checkin',0)}건")
-        col3.metric("대기(초록)", f"{summ.get('nocheck',0)}건")
-        st.divider()
-        zones = mon_data.get("zones", {})
-        for z_name in ["A", "B", "C", "D", "E", "F", "기타"]:
-            if z_name not in zones: continue
-            z_data = zones[z_name]
-            blues = z_data.get("blue", [])
-            greens = z_data.get("green", [])
-            if not blues and not greens: continue
-            with st.expander(f"📍 {z_name} 구역 ({len(blues)+len(greens)}건)", expanded=True):
-                if blues:
-                    for b in blues: st.markdown(f"<div class='stat-card stat-blue'>{b}</div>", unsafe_allow_html=True)
-                if greens:
-                    for g in greens: st.markdown(f"<div class='stat-card stat-green'>{g}</div>", unsafe_allow_html=True)
-    else: st.warning("데이터가 없습니다. PC 프로그램에서 분석을 실행해주세요.")
-
-# 5. 분실물 탭
-with tab_lost:
-    st.subheader("🧢 분실물 센터")
-    raw_lost = get_data("lost_found")
-    lost_items = []
-    if isinstance(raw_lost, dict): lost_items = list(raw_lost.values())
-    elif isinstance(raw_lost, list): lost_items = [x for x in raw_lost if x]
-    
-    with st.expander("➕ 분실물 등록 (즉시 저장)", expanded=False):
-        c1, c2 = st.columns(2)
-        l_loc = c1.text_input("장소")
-        l_nm = c2.text_input("물건명")
-        if st.button("등록", use_container_width=True):
-            if l_loc and l_nm:
-                latest_raw = get_data("lost_found")
-                latest_items = []
-                if isinstance(latest_raw, dict): latest_items = list(latest_raw.values())
-                elif isinstance(latest_raw, list): latest_items = [x for x in latest_raw if x]
-                
-                new_l = {"date": datetime.now().strftime("%Y-%m-%d"), "item": l_nm, "location": l_loc, "status": "보관중", "return_date": "-"}
-                latest_items.append(new_l)
-                set_data("lost_found", latest_items)
-                st.toast("클라우드 저장 완료")
-                st.rerun()
-
-    cnt = len([x for x in lost_items if x.get('status')=='보관중'])
-    st.markdown(f"**보관중: {cnt}개**")
-    for i, item in reversed(list(enumerate(lost_items))):
-        is_kept = (item.get('status') == "보관중")
-        with st.container(border=True):
-            c_txt, c_btn = st.columns([3, 1])
-            with c_txt:
-                icon = "🟢" if is_kept else "⚪"
-                st.write(f"{icon} **{item.get('item')}**")
-                st.caption(f"{item.get('location')} | {item.get('date')}")
-            with c_btn:
-                if is_kept:
-                    if st.button("수령", key=f"rec_{i}"):
-                        latest_raw = get_data("lost_found")
-                        latest_items = []
-                        if isinstance(latest_raw, dict): latest_items = list(latest_raw.values())
-                        elif isinstance(latest_raw, list): latest_items = [x for x in latest_raw if x]
-                        
-                        found_idx = -1
-                        for idx, li in enumerate(latest_items):
-                             if (li.get('item') == item['item'] and 
-                                 li.get('date') == item['date'] and 
-                                 li.get('location') == item['location']):
-                                 found_idx = idx
-                                 break
-                        
-                        if found_idx != -1:
-                            latest_items[found_idx]['status'] = "수령완료"
-                            latest_items[found_idx]['return_date'] = datetime.now().strftime("%Y-%m-%d")
-                            set_data("lost_found", latest_items)
-                            st.toast("수령 처리 저장됨")
-                            st.rerun()
-                else:
-                    if st.button("삭제", key=f"del_{i}"):
-                        latest_raw = get_data("lost_found")
-                        latest_items = []
-                        if isinstance(latest_raw, dict): latest_items = list(latest_raw.values())
-                        elif isinstance(latest_raw, list): latest_items = [x for x in latest_raw if x]
-                        
-                        found_idx = -1
-                        for idx, li in enumerate(latest_items):
-                             if (li.get('item') == item['item'] and 
-                                 li.get('date') == item['date'] and 
-                                 li.get('location') == item['location']):
-                                 found_idx = idx
-                                 break
-                        
-                        if found_idx != -1:
-                            del latest_items[found_idx]
-                            set_data("lost_found", latest_items)
-                            st.toast("삭제 저장됨")
-                            st.rerun()
-
-
+import streamlit as st
+import firebase_admin
+from firebase_admin import credentials
+from datetime import datetime, timedelta
+import os
+import json
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from datastore import SnapshotCache, LiveMirror, TransactionAborted, make_backend, new_push_id, prefetch, server_increment, overlay_read, clean_path
+from roster import normalize_data, month_range_keys, team_lists, get_auto_duty_members, cached_calendar_html, monthly_totals, summary_delta, summary_values, apply_summary_delta, build_summary, summary_built, month_summary, SUMMARY_BUILT, member_ref, batch_dates, WEEKDAY_LABELS, month_roster, plan_month_rules, roster_matrix_html, ROTATION_TYPES, TIME_TYPES, build_member_index, index_logs, prev_date_key, record_items
+from model import canonical_record
+import perf
+import report
+from validate import check_entries, audit_months, split_issues
+from export import iter_export, iter_months, csv_chunks, ics_chunks
+from results import monitor_cards, filter_monitor, monitor_html, stay_rows, filter_stay, stay_html, MONITOR_STATUS, STAY_KINDS
+from lost_found import lost_item_list, lost_rows, lost_index_changes, archive_batches, LOST_KEPT, LOST_RETURNED, LOST_DELETING
+
+# --- 기본 설정 ---
+CRED_FILENAME = "service.json" 
+FIREBASE_DB_URL = 'https://ydcpmanager-default-rtdb.firebaseio.com/'
+
+st.set_page_config(
+    page_title="율동공원 모바일", 
+    page_icon="⛺", 
+    layout="wide",
+    initial_sidebar_state="expanded"  # 사이드바 보이게 설정
+)
+
+# ==========================================
+# 🔐 로그인 시스템
+# ==========================================
+if 'logged_in' not in st.session_state:
+    st.session_state.logged_in = False
+
+def check_password():
+    if "PASSWORD" in st.secrets:
+        system_pass = st.secrets["PASSWORD"]
+    else:
+        system_pass = "0616"
+    
+    if st.session_state.password_input == system_pass:
+        st.session_state.logged_in = True
+    else:
+        st.error("비밀번호가 틀렸습니다.")
+
+if not st.session_state.logged_in:
+    st.markdown("## 🔒 관리자 로그인")
+    st.text_input("비밀번호를 입력하세요", type="password", key="password_input", on_change=check_password)
+    if st.button("로그인"):
+        check_password()
+    st.stop()
+
+# --- 성능 측정 (선택) ---
+# secrets 에 PERF_TRACE = true 이면 화면을 그릴 때마다 DB 경로/그리기 단계별 횟수, 시간, 크기를 모아
+# 사이드바 '⏱️ 성능 측정' 에 보여 준다. PERF_LOG 에 파일 경로를 주면 한 번 그릴 때마다 JSON 한 줄씩 덧붙인다.
+PERF_TRACE = bool(st.secrets["PERF_TRACE"]) if "PERF_TRACE" in st.secrets else False
+PERF_LOG = st.secrets["PERF_LOG"] if "PERF_LOG" in st.secrets else None
+perf.begin(PERF_TRACE)
+get_auto_duty_members = perf.traced("get_auto_duty_members")(get_auto_duty_members)
+
+# ==========================================
+# 🎨 UI 스타일 (모바일 최적화)
+# ==========================================
+st.markdown("""
+<style>
+    .stApp { font-family: 'Pretendard', 'Malgun Gothic', sans-serif; }
+    
+    /* 캘린더 컨테이너 */
+    .cal-container { 
+        display: flex; 
+        flex-direction: column; 
+        border: 1px solid #ddd; 
+        background-color: #fff; 
+        border-radius: 8px;
+        overflow: hidden; 
+    }
+    .cal-header-row { 
+        display: grid; 
+        grid-template-columns: repeat(7, 1fr); 
+        background-color: #f8f9fa; 
+        border-bottom: 1px solid #ddd; 
+    }
+    .cal-header-item { 
+        text-align: center; 
+        font-weight: bold; 
+        padding: 8px 0; 
+        font-size: 0.9rem; 
+        color: #495057; 
+    }
+    .cal-header-item:nth-child(6) { color: #1c7ed6; }
+    .cal-header-item:nth-child(7) { color: #e03131; }
+    
+    .cal-grid { 
+        display: grid; 
+        grid-template-columns: repeat(7, 1fr); 
+        background-color: #dee2e6; 
+        gap: 1px; 
+    }
+    .cal-cell { 
+        background-color: #ffffff; 
+        min-height: 60px; 
+        height: auto;
+        padding: 4px 2px; 
+        display: flex; 
+        flex-direction: column; 
+        gap: 2px;
+    }
+    .cal-cell.empty { background-color: #f8f9fa; min-height: 60px; }
+    
+    .date-num { 
+        font-size: 0.8rem; 
+        font-weight: bold; 
+        margin-bottom: 2px; 
+        padding-left: 4px; 
+        color: #333; 
+    }
+    .cal-cell:nth-child(7n-1) .date-num { color: #1c7ed6; }
+    .cal-cell:nth-child(7n) .date-num { color: #e03131; }
+
+    .work-box { 
+        font-size: 0.75rem; 
+        padding: 3px 4px; 
+        border-radius: 4px; 
+        line-height: 1.3; 
+        color: #333; 
+        font-weight: 500; 
+        word-break: keep-all; 
+        white-space: normal; 
+    }
+    .wb-a { background-color: #e7f5ff; border: 1px solid #d0ebff; color: #1864ab; }
+    .wb-b { background-color: #fff4e6; border: 1px solid #ffe8cc; color: #d9480f; }
+    .wb-rest { background-color: #ffe3e3; color: #c92a2a; text-align: center; }
+    
+    .badge { 
+        font-size: 0.7rem; 
+        padding: 3px 4px; 
+        border-radius: 4px; 
+        margin-top: 1px; 
+        color: white; 
+        display: block; 
+        white-space: normal; 
+        line-height: 1.2;
+    }
+    .bg-night { background-color: #D32F2F; } 
+    .bg-leave { background-color: #2E7D32; } 
+    .bg-ot { background-color: #1A237E; }    
+    .bg-gray { background-color: #868e96; }
+    
+    @media (max-width: 600px) { 
+        .cal-header-item { font-size: 0.7rem; padding: 4px 0; } 
+        .cal-cell { min-height: 50px; padding: 2px; } 
+        .date-num { font-size: 0.7rem; margin-bottom: 1px; } 
+        .work-box { font-size: 0.65rem; padding: 2px 3px; letter-spacing: -0.5px; } 
+        .badge { font-size: 0.65rem; padding: 2px 3px; letter-spacing: -0.5px; } 
+    }
+    
+    .stat-card { padding: 10px; border-radius: 8px; text-align: center; margin-bottom: 5px; }
+    .stat-blue { background-color: #e3f2fd; color: #1565c0; border: 1px solid #90caf9; }
+    .stat-green { background-color: #e8f5e9; color: #2e7d32; border: 1px solid #a5d6a7; }
+
+    .zone-box { margin-bottom: 8px; border: 1px solid #e0e0e0; border-radius: 8px; padding: 6px 8px; }
+    .zone-box summary { font-weight: bold; cursor: pointer; padding: 4px 0; }
+    .stay-card { padding: 10px; border-radius: 8px; margin-bottom: 5px; }
+    .stay-move { background-color: #fff8e1; color: #8d6e00; border: 1px solid #ffe082; }
+    .stay-stay { background-color: #e3f2fd; color: #1565c0; border: 1px solid #90caf9; }
+    .result-empty { padding: 10px; color: #888; text-align: center; }
+</style>
+""", unsafe_allow_html=True)
+
+# --- Firebase 초기화 ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CRED_PATH = os.path.join(CURRENT_DIR, CRED_FILENAME)
+
+@st.cache_resource
+def init_firebase():
+    if firebase_admin._apps: return True
+    
+    if "firebase_key" in st.secrets:
+        try:
+            val = st.secrets["firebase_key"]
+            if isinstance(val, str): cred_info = json.loads(val)
+            else: cred_info = dict(val)
+            
+            if "private_key" in cred_info: 
+                cred_info["private_key"] = cred_info["private_key"].replace("\\n", "\n")
+            
+            cred = credentials.Certificate(cred_info)
+            firebase_admin.initialize_app(cred, {'databaseURL': FIREBASE_DB_URL})
+            return True
+        except Exception as e: st.error(f"Cloud 인증 오류: {e}"); return False
+    
+    if os.path.exists(CRED_PATH):
+        try:
+            cred = credentials.Certificate(CRED_PATH)
+            firebase_admin.initialize_app(cred, {'databaseURL': FIREBASE_DB_URL})
+            return True
+        except Exception as e: st.error(f"로컬 인증 오류: {e}"); return False
+    
+    st.warning("⚠️ 인증 파일을 찾을 수 없습니다.")
+    return False
+
+# --- 저장소 백엔드 ---
+# 기본은 Firebase. 오프라인 프로파일링/부하 테스트는 secrets 에
+# DATA_BACKEND = "memory" (DATA_FILE 은 시작 데이터) 또는 "json" (DATA_FILE 에 저장) 으로 설정한다.
+DATA_BACKEND = st.secrets["DATA_BACKEND"] if "DATA_BACKEND" in st.secrets else "firebase"
+DATA_FILE = st.secrets["DATA_FILE"] if "DATA_FILE" in st.secrets else os.path.join(CURRENT_DIR, "local_db.json")
+
+if DATA_BACKEND == "firebase":
+    with perf.span("init_firebase"): firebase_ok = init_firebase()
+    if not firebase_ok: st.stop()
+
+@st.cache_resource
+def get_backend():
+    backend = make_backend(DATA_BACKEND, DATA_FILE)
+    return perf.TracedBackend(backend) if PERF_TRACE else backend
+
+# --- 데이터 캐시 (세션 공유) ---
+@st.cache_resource
+def get_cache():
+    ttl = st.secrets["CACHE_TTL"] if "CACHE_TTL" in st.secrets else 60
+    return SnapshotCache(ttl=ttl)
+
+# --- 실시간 미러 (선택) ---
+# secrets 에 LIVE_SYNC = true 이면 리스너로 yuldong_data 를 메모리에 유지하고 읽기는 메모리에서 한다.
+LIVE_SYNC = bool(st.secrets["LIVE_SYNC"]) if "LIVE_SYNC" in st.secrets else False
+
+@st.cache_resource
+def get_mirror():
+    return LiveMirror()
+
+def live_mirror():
+    if not LIVE_SYNC: return None
+    mirror = get_mirror()
+    if mirror.ensure_started(get_backend().listen): return mirror
+    return None
+
+# --- DB 헬퍼 ---
+# 읽기는 미러/캐시를 거치고, 캐시를 거치지 않고 최신 값을 읽을 때는 cached=False 로 읽는다.
+# 미러/캐시에서 읽은 값에는 이 세션에서 아직 저장 중인 변경(edit_overlay)을 덧씌운다.
+# (측정을 켜면 get_data/get_range/get_last/set_data 는 캐시 적중까지 포함한 호출, db.* 는 실제 백엔드 왕복)
+def get_data(path, cached=True):
+    with perf.span("get_data", path) as sp:
+        if not cached: return sp.size(get_backend().get(path))
+        mirror = live_mirror()
+        data = mirror.get(path) if mirror else get_cache().get(path, lambda: get_backend().get(path))
+        return sp.size(with_overlay(data, path))
+
+# 키 순서 범위 조회 (records 처럼 YYYY-MM-DD 로 키가 정렬되는 노드용)
+def get_range(path, start, end):
+    with perf.span("get_range", f"{path} [{start}~{end}]") as sp:
+        mirror = live_mirror()
+        loader = lambda: get_backend().get_range(path, start, end)
+        data = mirror.get_range(path, start, end) if mirror else get_cache().get(path, loader, start=start, end=end)
+        return sp.size(with_overlay(data, path, start, end))
+
+# 키 순서로 end 이하 마지막 limit 개 (member_index 처럼 최신 항목부터 페이지로 넘길 때)
+def get_last(path, limit, end=None):
+    with perf.span("get_last", f"{path} [~{end or ''} {limit}개]") as sp:
+        mirror = live_mirror()
+        loader = lambda: get_backend().get_last(path, limit, end)
+        data = mirror.get_last(path, limit, end) if mirror else get_cache().get(path, loader, end=end, limit=limit)
+        return sp.size(with_overlay(data, path, end=end, limit=limit))
+
+def set_data(path, data):
+    with perf.span("set_data", path) as sp:
+        get_backend().set(path, sp.size(data))
+        # 쓴 값을 캐시에 바로 반영해 다시 그릴 때 불러오지 않는다. (write-through)
+        get_cache().patch(path, {"": data})
+        # 리스너 이벤트가 도착하기 전에 다시 그려도 방금 쓴 값이 보이도록 미러에도 바로 반영
+        if LIVE_SYNC: get_mirror().apply(path, data)
+
+# 여러 하위 경로를 한 번에 쓴다. changes 의 키는 path 기준 상대 경로, 값이 None 이면 삭제.
+def update_data(path, changes):
+    get_backend().update(path, changes)
+    get_cache().patch(path, changes)
+    if LIVE_SYNC: get_mirror().apply_patch(path, changes)
+
+# --- 트랜잭션 쓰기 ---
+# 읽어서 고친 뒤 통째로 set 하면 동시에 고친 다른 직원의 변경이 사라지므로 읽은 값에 따라 달라지는 쓰기는 트랜잭션으로 한다.
+# fn(현재값) -> 새 값. 충돌하면 최신 값으로 다시 불리므로 fn 은 여러 번 불려도 되게 쓴다.
+# 고칠 대상이 없으면 fn 안에서 RecordMissing 을 낸다. 반환값은 충돌 재시도 횟수.
+class RecordMissing(Exception):
+    pass
+
+def transact_data(path, fn):
+    new_value, retries = get_backend().transaction(path, fn)
+    get_cache().patch(path, {"": new_value})
+    if LIVE_SYNC: get_mirror().apply(path, new_value)
+    return retries
+
+# 지운 값으로 합계를 고치는 삭제는 먼저 트랜잭션으로 삭제 표시(DELETE_CLAIM: 시각)를 써서 항목을 차지한다.
+# 같은 항목을 두 세션(서버가 여러 대여도)이 동시에 지우면 한쪽만 차지하고, 다른 쪽은 RecordMissing 이라 두 번 빼지 않는다.
+# 차지한 뒤 지우지 못하고 멈춘 표시는 DELETE_CLAIM_SEC 가 지나면 다시 차지할 수 있다. 반환값은 (차지하기 전 값, 재시도 횟수)
+DELETE_CLAIM = "deleting"
+DELETE_CLAIM_SEC = 60
+
+def claim_delete(path):
+    before = {}
+    def fn(current):
+        claimed_at = current.get(DELETE_CLAIM) if isinstance(current, dict) else None
+        if not isinstance(current, dict) or (isinstance(claimed_at, (int, float)) and time.time() - claimed_at < DELETE_CLAIM_SEC):
+            raise RecordMissing(path)
+        before.clear()
+        before.update({k: v for k, v in current.items() if k != DELETE_CLAIM})
+        return {**current, DELETE_CLAIM: time.time()}
+    retries = transact_data(path, fn)
+    return before, retries
+
+# --- 날짜별 기록 쓰기 ---
+# 기록은 schedule/records/{날짜}/{id} 에 하나씩 두므로 추가/삭제는 그 자식 하나만 쓴다.
+# 직원별 색인(schedule/member_index)은 같은 id 로 함께 쓰고,
+# 월별 합계(schedule/summary)는 직원마다 변화량을 더하는 트랜잭션으로 고친다.
+# 달 노드가 그 달 records 전체로 만든 것(SUMMARY_BUILT)이 아니면 변화량 대신 (방금 쓴 기록을 포함한) 그 달 records 로 다시 만든다.
+def update_summary(month_key, added=(), removed=()):
+    path = f"schedule/summary/{month_key}"
+    if not get_data(f"{path}/{SUMMARY_BUILT}", cached=False):
+        records = get_backend().get_range("schedule/records", *month_range_keys(int(month_key[:4]), int(month_key[5:7])))
+        set_data(path, month_summary(records, month_key))
+        return 0
+    retries = 0
+    for name, delta in summary_delta(added, removed).items():
+        retries += transact_data(f"schedule/summary/{month_key}/{name}", lambda node, delta=delta: apply_summary_delta(node, delta))
+    return retries
+
+# entries = [(날짜 키, 기록), ...] 를 기록/색인 한 번의 multi-path update 로 쓰고 월마다 합계를 고친다.
+# id 를 미리 정한 변경(schedule 기준)을 먼저 만들어 두므로 쓰기 전에 같은 값을 화면에 반영할 수 있다.
+def record_changes(entries):
+    changes = {}
+    for d_key, rec in entries:
+        rid, rec = new_push_id(), canonical_record(rec)
+        changes[f"records/{d_key}/{rid}"] = rec
+        changes[f"member_index/{rec['name']}/{d_key}/{rid}"] = member_ref(rec)
+    return changes
+
+def write_records(changes):
+    update_data("schedule", changes)
+    by_month = {}
+    for key, rec in changes.items():
+        if key.startswith("records/"): by_month.setdefault(key[8:15], []).append(rec)
+    return sum(update_summary(month_key, added=recs) for month_key, recs in by_month.items())
+
+
+def delete_record(d_key, rid):
+    # 기록을 차지한 쪽만 기록과 색인을 한 번의 update 로 지우고 합계에서 뺀다. (Firebase 트랜잭션은 None 을 돌려 지울 수 없다)
+    rec, retries = claim_delete(f"schedule/records/{d_key}/{rid}")
+    changes = {f"records/{d_key}/{rid}": None}
+    if rec.get('name'): changes[f"member_index/{rec['name']}/{d_key}/{rid}"] = None
+    update_data("schedule", changes)
+    return retries + update_summary(d_key[:7], removed=[rec])
+
+# 합계 미리 반영: 달 노드를 쓰는 달이면 화면에 보이는 값에 변화량을 더한다. (아니면 카드가 records 로 계산하므로 없음)
+def summary_preview(month_key, added=(), removed=()):
+    node = get_data(f"schedule/summary/{month_key}")
+    if not summary_built(node): return {}
+    return {f"schedule/summary/{month_key}/{name}": apply_summary_delta(node.get(name), delta)
+            for name, delta in summary_delta(added, removed).items()}
+
+def record_delete_preview(d_key, rid, rec):
+    return {f"schedule/records/{d_key}/{rid}": None, f"schedule/member_index/{rec.get('name')}/{d_key}/{rid}": None,
+            **summary_preview(d_key[:7], removed=[rec])}
+
+# --- 버튼 쓰기 (낙관적 반영) ---
+# 버튼은 on_click 으로 run_edit 을 부른다. 바뀔 값 preview (ROOT 기준 {경로: 값}) 는 이 세션의 덧씌우기(edit_overlay)로만 두고
+# 실제 쓰기는 쓰기 스레드에서 하므로, 버튼이 일으킨 실행은 다시 불러오지 않고 덧씌운 값으로 바로 그린다.
+# 공유 캐시/미러에는 쓰기 스레드의 update_data 등이 서버가 받은 값만 반영하므로 다른 직원 화면에는 확정된 값만 보인다.
+# 쓰기 결과(충돌 재시도 횟수 포함)는 edit_status 가 토스트로 알리고 덧씌우기를 거둔다. 실패했으면 서버 값으로 다시 그린다.
+# preview 가 없으면 그 자리에서 쓰고 결과를 알린다.
+EDIT_POLL_SEC = 1
+_edit_thread = threading.local()   # 쓰기 스레드에서 읽을 때는 덧씌우기를 쓰지 않는다
+
+@st.cache_resource
+def get_edit_pool():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="edit")  # 쓰기 순서를 지키도록 하나씩
+
+# 아직 결과를 알리지 않은 쓰기들의 preview 를 순서대로 합친 것
+def edit_overlay():
+    if getattr(_edit_thread, "active", False): return {}
+    overlay = {}
+    for _, preview in st.session_state.get("edit_pending") or []: overlay.update(preview)
+    return overlay
+
+def with_overlay(data, path, start=None, end=None, limit=None):
+    overlay = edit_overlay()
+    if not overlay: return data
+    return overlay_read((clean_path(path), start, end, limit), data, overlay)
+
+def edit_outcome(write, ok_msg, missing_msg):
+    # (토스트 문구, 실패 여부)
+    try:
+        retries = write()
+        return (f"{ok_msg} (동시 수정으로 {retries}회 재시도)" if retries else ok_msg), False
+    except RecordMissing:
+        return missing_msg, True
+    except TransactionAborted:
+        return "다른 직원이 동시에 수정하고 있어 저장하지 못했습니다. 다시 시도해 주세요.", True
+    except Exception as e:
+        return f"저장하지 못해 되돌렸습니다: {e}", True
+
+def run_edit(write, ok_msg, missing_msg=None, preview=None):
+    if preview is None:
+        msg, _ = edit_outcome(write, ok_msg, missing_msg)
+        if msg: st.toast(msg)
+        return
+    ctx = get_script_run_ctx()
+
+    def job():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        _edit_thread.active = True
+        return edit_outcome(write, ok_msg, missing_msg)
+    st.session_state.setdefault("edit_pending", []).append((get_edit_pool().submit(job), preview))
+
+# 기록 추가/삭제 (버튼 on_click 과 폼에서 부른다)
+def edit_add_records(entries, ok_msg):
+    changes = record_changes(entries)
+    preview = {f"schedule/{k}": v for k, v in changes.items()}
+    by_month = {}
+    for key, rec in changes.items():
+        if key.startswith("records/"): by_month.setdefault(key[8:15], []).append(rec)
+    for month_key, recs in by_month.items(): preview.update(summary_preview(month_key, added=recs))
+    run_edit(partial(write_records, changes), ok_msg, preview=preview)
+
+# rec 는 화면에 보이는 기록 (이름/구분/내용, 합계 미리 반영용)
+def edit_delete_record(d_key, rid, rec, ok_msg, missing_msg=None):
+    run_edit(partial(delete_record, d_key, rid), ok_msg, missing_msg, preview=record_delete_preview(d_key, rid, rec))
+
+# 끝난 쓰기의 결과를 알리고 그 preview 를 덧씌우기에서 뺀다. 실패(되돌림)가 있었으면 True
+def edit_results():
+    done, pending = [], []
+    for entry in st.session_state.get("edit_pending") or []: (done if entry[0].done() else pending).append(entry)
+    st.session_state.edit_pending = pending
+    failed = False
+    for f, _ in done:
+        msg, fail = f.result()
+        if msg: st.toast(msg)
+        failed |= fail
+    return failed
+
+@st.fragment(run_every=EDIT_POLL_SEC)
+def edit_status():
+    if edit_results(): st.rerun()
+    if st.session_state.get("edit_pending"): st.caption("💾 저장 중...")
+
+# PC 프로그램이 records 를 직접 올리면 합계/색인이 어긋나므로 전체 records 로 다시 계산한다.
+def rebuild_indexes():
+    records = get_data("schedule/records", cached=False)
+    update_data("schedule", {"summary": build_summary(records) or None, "member_index": build_member_index(records) or None,
+                             "member_index_built": True})
+
+# 직원별 색인은 전체 records 로 한 번 만든 뒤(schedule/member_index_built)부터 믿는다.
+# 그 전에 기록을 쓰며 더한 항목만으로는 예전 기록이 빠지므로, 아직 만들지 않았으면 처음 볼 때 한 번 만든다.
+def ensure_member_index():
+    if get_data("schedule/member_index_built"): return
+    records = get_data("schedule/records", cached=False)
+    update_data("schedule", {"member_index": build_member_index(records) or None, "member_index_built": True})
+
+# --- 직원별 최근 기록 (최신순 LOG_PAGE_SIZE 개씩) ---
+# 색인 키가 날짜라 한 번에 LOG_PAGE_SIZE 일씩 받는다. (날짜마다 기록이 하나 이상이므로 한 번 받으면 한 페이지가 찬다)
+# 하루에 기록이 여럿이어도 화면에는 기록 수로 잘라 보여 준다.
+LOG_PAGE_SIZE = 10
+
+def load_member_logs(name, pages):
+    # (최신 기록 pages * LOG_PAGE_SIZE 개, 더 오래된 기록이 있는지)
+    want, logs, end = pages * LOG_PAGE_SIZE, [], None
+    while len(logs) <= want:
+        page = get_last(f"schedule/member_index/{name}", LOG_PAGE_SIZE, end)
+        if not page: break
+        logs += index_logs(page)
+        if len(page) < LOG_PAGE_SIZE: break
+        end = prev_date_key(min(page))
+    return logs[:want], len(logs) > want
+
+# --- 분실물 목록 (보관중 전체 + 수령완료 LOST_PAGE_SIZE 개씩) ---
+LOST_PAGE_SIZE = 20
+LOST_ARCHIVE_DAYS = st.secrets["LOST_ARCHIVE_DAYS"] if "LOST_ARCHIVE_DAYS" in st.secrets else 90
+
+def load_lost_returns(pages):
+    # lost_index/returned 를 키(등록 순) 역순으로 넘긴다. (오래된 것부터 정렬된 목록, 더 있는지)
+    items, end = [], None
+    for _ in range(pages):
+        page = lost_item_list(get_last("lost_index/returned", LOST_PAGE_SIZE + (1 if end else 0), end))
+        page = [p for p in page if p[0] != end]
+        if not page: return items, False
+        items = page + items
+        if len(page) < LOST_PAGE_SIZE: return items, False
+        end = page[0][0]
+    return items, True
+
+def load_lost_view(pages):
+    # (보관중 개수, 보관중 항목, 수령완료 항목, 수령완료가 더 있는지)
+    cnt = get_data("lost_index/kept_count")
+    if cnt is not None:
+        returned, has_more = load_lost_returns(pages)
+        return cnt, lost_item_list(get_data("lost_index/kept")), returned, has_more
+    # 색인이 아직 없으면 전체 목록에서 나눈다.
+    lost_items = lost_item_list(get_data("lost_found"))
+    kept = [p for p in lost_items if p[1].get('status') == LOST_KEPT]
+    returned = [p for p in lost_items if p[1].get('status') != LOST_KEPT]
+    shown = returned[-pages * LOST_PAGE_SIZE:]
+    return len(kept), kept, shown, len(shown) < len(returned)
+
+# 수령한 지 LOST_ARCHIVE_DAYS 일이 지난 항목을 lost_archive/{수령월} 로 옮긴다.
+def archive_lost(days=None):
+    cutoff = (datetime.now() - timedelta(days=days if days is not None else LOST_ARCHIVE_DAYS)).strftime("%Y-%m-%d")
+    moved = 0
+    for changes in archive_batches(get_data("lost_found", cached=False), cutoff):
+        update_data("", changes)
+        moved += sum(1 for k in changes if k.startswith("lost_archive/"))
+    return moved
+
+# --- 월 단위 schedule 조회 ---
+# 전체 records 대신 해당 월 + 전날(당직휴무 계산용)만 받아 schedule 과 같은 모양으로 돌려준다.
+def load_month_schedule(year, month):
+    month_key = f"{year}-{month:02d}"
+    start_key, end_key = month_range_keys(year, month)
+    return {
+        "records": get_range("schedule/records", start_key, end_key) or {},
+        "teams": get_data("schedule/teams") or {},
+        "month_rules": {month_key: get_data(f"schedule/month_rules/{month_key}") or {}},
+    }
+
+# --- 미리 불러오기 ---
+# 한 화면에 필요한 서로 다른 노드는 스레드 풀에서 동시에 불러 캐시에 채워 두고, 화면은 평소처럼 get_data 등으로 읽는다.
+# 읽기 하나는 캐시 키 모양 (path, start, end, limit). 미러를 쓰면 읽기가 메모리라 하지 않는다.
+PREFETCH_TIMEOUT = st.secrets["PREFETCH_TIMEOUT"] if "PREFETCH_TIMEOUT" in st.secrets else 5
+PREFETCH_WORKERS = 4
+
+@st.cache_resource
+def get_prefetch_pool():
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+def read_key(path, start=None, end=None, limit=None):
+    return (path, start, end, limit)
+
+def month_reads(year, month):
+    start_key, end_key = month_range_keys(year, month)
+    return [read_key("schedule/records", start_key, end_key), read_key("schedule/teams"),
+            read_key(f"schedule/month_rules/{year}-{month:02d}")]
+
+def prefetch_reads(reads):
+    if not reads or live_mirror(): return
+    with perf.span("prefetch", f"{len(reads)}개"):
+        prefetch(get_cache(), get_backend(), reads, get_prefetch_pool(), PREFETCH_TIMEOUT, wrap=perf.bind)
+
+# --- [NEW] 사이드바 설정 (로드/저장 설명) ---
+with st.sidebar:
+    st.header("☁️ DB 동기화")
+    
+    # [Load 버튼]
+    if st.button("🔄 최신 데이터 불러오기 (Load)", use_container_width=True):
+        get_cache().invalidate()
+        st.toast("☁️ 클라우드에서 최신 데이터를 불러왔습니다.")
+        st.rerun()
+    
+    st.info("""
+    **[저장(Save) 안내]**
+    
+    모바일 앱은 데이터 안전을 위해
+    **등록/삭제/수정 버튼 클릭 시**
+    **즉시 클라우드에 저장**됩니다.
+    
+    별도의 '전체 저장' 버튼은 없습니다.
+    """)
+    
+    with st.expander("🧰 관리 도구"):
+        st.caption("PC 프로그램에서 기록을 올린 뒤 월별 합계나 최근 기록이 맞지 않으면 다시 계산합니다.")
+        if st.button("📊 합계/기록 색인 재계산", use_container_width=True):
+            rebuild_indexes()
+            st.toast("월별 합계와 기록 색인을 다시 계산했습니다.")
+            st.rerun()
+        st.caption(f"수령한 지 {LOST_ARCHIVE_DAYS}일이 지난 분실물을 월별 보관 노드로 옮깁니다.")
+        if st.button("🧢 오래된 분실물 보관 처리", use_container_width=True):
+            st.toast(f"분실물 {archive_lost()}건을 보관 처리했습니다.")
+            st.rerun()
+
+    if st.button("로그아웃", use_container_width=True):
+        st.session_state.logged_in = False
+        st.rerun()
+
+# --- 실시간 동기화 상태 ---
+# 미러 version 이 이 화면을 그릴 때와 달라지면(PC 프로그램 업로드, 다른 직원 수정) 화면을 다시 그린다.
+if LIVE_SYNC:
+    st.session_state.mirror_seen = get_mirror().version
+
+    @st.fragment(run_every=st.secrets["LIVE_POLL_SEC"] if "LIVE_POLL_SEC" in st.secrets else 10)
+    def live_sync_status():
+        mirror = live_mirror()
+        if not mirror:
+            st.caption("⚪ 실시간 동기화 연결 중 (직접 조회)")
+            return
+        st.caption(f"🟢 실시간 동기화 중 (v{mirror.version})")
+        if st.session_state.get("mirror_seen") != mirror.version:
+            st.rerun()
+
+    with st.sidebar: live_sync_status()
+
+# --- 쓰기 결과 ---
+# 지난 실행에서 누른 버튼의 쓰기가 끝났으면 알리고, 아직이면 끝날 때까지 사이드바에서 확인한다.
+edit_results()
+if st.session_state.get("edit_pending"):
+    with st.sidebar: edit_status()
+
+# --- 달력 그리기 ---
+# 데이터 버전: 미러를 쓰면 미러 version, 아니면 load_month_schedule 이 읽은 세 캐시 항목의 version.
+# (TTL 이 지나 다시 불러오거나 쓰기로 무효화되면 바뀐다) 알 수 없으면 None 이라 캐시하지 않는다.
+# 저장 중인 변경을 덧씌운 세션의 결과는 다른 세션과 함께 쓰면 안 되므로 None.
+def month_data_version(year, month):
+    if edit_overlay(): return None
+    mirror = live_mirror()
+    if mirror: return ("live", mirror.version)
+    cache = get_cache()
+    start_key, end_key = month_range_keys(year, month)
+    versions = (cache.entry_version("schedule/records", start_key, end_key),
+                cache.entry_version("schedule/teams"),
+                cache.entry_version(f"schedule/month_rules/{year}-{month:02d}"))
+    return None if None in versions else versions
+
+@perf.traced("draw_calendar")
+def draw_calendar(year, month, sch_data, my_filter=None):
+    html = cached_calendar_html(year, month, sch_data, my_filter, month_data_version(year, month))
+    st.markdown(html, unsafe_allow_html=True)
+
+
+# --- 메인 탭 구성 ---
+st.title("🏕️ 율동공원 관리 시스템")
+
+if 'curr_date' not in st.session_state: st.session_state.curr_date = datetime.now()
+
+def get_members():
+    t1, t2 = team_lists(get_data("schedule/teams"))
+    return ["전체 보기"] + t1 + t2
+
+# --- 근무표 내보내기 (휴대폰 달력용 ICS, 인사 제출용 CSV) ---
+# 버튼을 눌렀을 때만 월 단위로 근무표를 걸으며 파일을 만든다. (필요한 달은 먼저 동시에 불러 둔다)
+EXPORT_MAX_DAYS = 366
+
+def render_export_panel(cur, members):
+    if not st.toggle("📤 근무표 내보내기 (ICS/CSV)", key="export_open"): return
+    with st.container(border=True):
+        first = cur.replace(day=1).date()
+        last = (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+        period = st.date_input("기간", value=(first, last), key="export_range")
+        c1, c2 = st.columns(2)
+        who = c1.selectbox("직원", members, key="export_member")
+        fmt = c2.radio("형식", ["ICS", "CSV"], horizontal=True, key="export_fmt")
+        if len(period) != 2:
+            st.info("끝 날짜를 선택하세요.")
+            return
+        start, end = period
+        if (end - start).days >= EXPORT_MAX_DAYS:
+            st.error(f"한 번에 {EXPORT_MAX_DAYS}일까지 내보낼 수 있습니다.")
+            return
+        if not st.button("📄 파일 만들기", use_container_width=True, key="export_build"): return
+
+        member = None if who == "전체 보기" else who
+        prefetch_reads([r for y, m in iter_months(start, end) for r in month_reads(y, m)])
+        rows = iter_export(load_month_schedule, start, end, member)
+        base = f"근무표_{member or '전체'}_{start:%Y%m%d}-{end:%Y%m%d}"
+        if fmt == "ICS":
+            data, mime, name = "".join(ics_chunks(rows)).encode("utf-8"), "text/calendar", f"{base}.ics"
+        else:
+            data, mime, name = "".join(csv_chunks(rows)).encode("utf-8-sig"), "text/csv", f"{base}.csv"
+        st.download_button(f"⬇️ {name} 내려받기", data, file_name=name, mime=mime, use_container_width=True)
+
+# --- 월 기록 점검 ---
+def render_audit_panel(cur):
+    if not st.toggle(f"🔎 {cur.month}월 기록 점검", key="audit_open"): return
+    errors, warns = split_issues(audit_months(load_month_schedule, cur, cur))
+    if not errors and not warns:
+        st.success("충돌이 없습니다.")
+        return
+    for level, issues, show in [("충돌", errors, st.error), ("주의", warns, st.warning)]:
+        if issues: show(f"**{level} {len(issues)}건**\n" + "\n".join(f"- {i.date} {i.name}: {i.message}" for i in issues))
+
+# 1. 근무표 탭
+def render_calendar_tab():
+    # [월 이동 로직]
+    def change_month(amount):
+        curr = st.session_state.curr_date
+        new_year = curr.year
+        new_month = curr.month + amount
+        
+        if new_month > 12:
+            new_month = 1
+            new_year += 1
+        elif new_month < 1:
+            new_month = 12
+            new_year -= 1
+            
+        st.session_state.curr_date = curr.replace(year=new_year, month=new_month, day=1)
+    
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1: st.button("◀", on_click=change_month, args=(-1,), use_container_width=True)
+    with c2: 
+        cur = st.session_state.curr_date
+        st.markdown(f"<h4 style='text-align:center; margin:0'>{cur.year}년 {cur.month}월</h4>", unsafe_allow_html=True)
+    with c3: st.button("▶", on_click=change_month, args=(1,), use_container_width=True)
+    
+    sch_data = load_month_schedule(cur.year, cur.month)
+    members = get_members()
+    
+    my_filter = st.selectbox("직원별 보기", members, label_visibility="collapsed")
+    draw_calendar(cur.year, cur.month, sch_data, my_filter)
+    render_export_panel(cur, members)
+    render_audit_panel(cur)
+
+    st.divider()
+    # 접혀 있는 동안에는 아무것도 불러오지 않도록 토글을 켰을 때만 내용을 그린다.
+    if not st.toggle("🛠️ 날짜별 일정 관리 (삭제 및 휴무)", key="manage_open"): return
+    with st.container(border=True):
+        st.caption("🚨 삭제 버튼을 누르면 해당 항목을 삭제하고 **즉시 저장(Save)**합니다.")
+        
+        del_date = st.date_input("관리할 날짜 선택", value=cur)
+        del_key = del_date.strftime("%Y-%m-%d")
+        
+        fresh_sch = load_month_schedule(del_date.year, del_date.month)
+        all_recs = normalize_data(fresh_sch.get("records", {}))
+        
+        target_list = record_items(all_recs.get(del_key))
+
+        st.subheader("1️⃣ 등록된 일정 (삭제)")
+        
+        manual_exists = False
+        for rid, rec in target_list:
+            if rec.get('type') in ['휴무', '팀휴무', '당직휴무']: continue 
+            manual_exists = True
+            
+            with st.container(border=True):
+                cols = st.columns([4, 1])
+                icon = {"당직": "🌙", "연차": "🌴", "시간외": "⏰"}.get(rec['type'], "📝")
+                
+                with cols[0]:
+                    st.write(f"{icon} **{rec['name']}** {rec['type']} ({rec.get('val', '')})")
+                
+                with cols[1]:
+                    st.button("삭제", key=f"del_{del_key}_{rid}", use_container_width=True, on_click=edit_delete_record,
+                              args=(del_key, rid, rec, "삭제 후 저장되었습니다.", "이미 삭제되었거나 데이터가 변경되었습니다."))
+        
+        if not manual_exists:
+            st.caption("등록된 개인 일정이 없습니다.")
+
+        st.divider()
+        st.subheader("2️⃣ 자동 생성 근무자 (제외 처리)")
+        
+        auto_members = get_auto_duty_members(del_date, fresh_sch)
+        
+        if not auto_members:
+            st.caption("이 날은 근무자가 없습니다.")
+        else:
+            for mem in auto_members:
+                with st.container(border=True):
+                    c1, c2 = st.columns([4, 1])
+                    with c1: st.write(f"👷 **{mem}** (자동 배정)")
+                    with c2:
+                        new_rec = {"type": "휴무", "name": mem, "val": "모바일제외"}
+                        st.button("제외", key=f"excl_{del_key}_{mem}", use_container_width=True, on_click=edit_add_records,
+                                  args=([(del_key, new_rec)], f"{mem}님 제외 설정 저장됨."))
+                            
+        excluded_list = [(rid, r) for rid, r in target_list if r.get('type') == '휴무']
+        if excluded_list:
+            st.divider()
+            st.caption("🚫 현재 제외된 근무자")
+            for rid, rec in excluded_list:
+                with st.container(border=True):
+                    c1, c2 = st.columns([4, 1])
+                    with c1: st.write(f"❌ **{rec['name']}** (제외됨)")
+                    with c2:
+                        st.button("복구", key=f"rest_{del_key}_{rid}", use_container_width=True, on_click=edit_delete_record,
+                                  args=(del_key, rid, rec, "복구되어 저장되었습니다."))
+
+# 2. 내 수정 탭
+def render_my_tab():
+    st.subheader("근무 기록 관리")
+    cur = st.session_state.curr_date
+    members = get_members()
+    sel_name = st.selectbox("직원 선택", [m for m in members if m != "전체 보기"])
+    
+    if sel_name:
+        cur_y, cur_m = cur.year, cur.month
+        month_prefix = f"{cur_y}-{cur_m:02d}"
+        # 월별 합계 노드를 읽는다. 그 달 records 전체로 만든 노드가 아니면 그 달 records 로 계산한다.
+        month_node = get_data(f"schedule/summary/{month_prefix}")
+        if summary_built(month_node):
+            sum_ot, sum_leave, cnt_night = summary_values(month_node.get(sel_name))
+        else:
+            month_recs = normalize_data(load_month_schedule(cur_y, cur_m)["records"])
+            sum_ot, sum_leave, cnt_night = monthly_totals(month_recs, sel_name, month_prefix)
+
+        st.markdown(f"##### 📊 {cur_y}년 {cur_m}월 {sel_name}님 합계")
+        c1, c2, c3 = st.columns(3)
+        c1.markdown(f"<div style='background:#E3F2FD;padding:10px;border-radius:5px;text-align:center;border:1px solid #90CAF9'><div style='font-size:0.8rem;color:#1565C0'>⏰ 시간외</div><div style='font-size:1.2rem;font-weight:bold;color:#0D47A1'>{sum_ot:g}H</div></div>", unsafe_allow_html=True)
+        c2.markdown(f"<div style='background:#E8F5E9;padding:10px;border-radius:5px;text-align:center;border:1px solid #A5D6A7'><div style='font-size:0.8rem;color:#2E7D32'>🌴 연차</div><div style='font-size:1.2rem;font-weight:bold;color:#1B5E20'>{sum_leave:g}H</div></div>", unsafe_allow_html=True)
+        c3.markdown(f"<div style='background:#FFEBEE;padding:10px;border-radius:5px;text-align:center;border:1px solid #FFCDD2'><div style='font-size:0.8rem;color:#C62828'>🌙 당직</div><div style='font-size:1.2rem;font-weight:bold;color:#B71C1C'>{cnt_night}회</div></div>", unsafe_allow_html=True)
+        
+        st.divider()
+        st.write("📝 **새로운 기록 추가** (저장 시 클라우드 반영)")
+        # 기간 입력: 시작~끝 날짜 중 고른 요일(과 근무일)마다 같은 기록을 한 번의 update 로 저장
+        range_mode = st.toggle("📆 기간으로 입력", key="range_mode")
+        with st.form("new_schedule"):
+            if range_mode:
+                c_s, c_e = st.columns(2)
+                in_start = c_s.date_input("시작일", value=datetime.now())
+                in_end = c_e.date_input("종료일", value=datetime.now())
+                in_days = st.multiselect("요일", WEEKDAY_LABELS, default=WEEKDAY_LABELS)
+                skip_rest = st.checkbox("근무표상 쉬는 날 제외", value=True)
+            else:
+                in_date = st.date_input("날짜", value=datetime.now())
+            in_type = st.selectbox("구분", ["시간외", "당직", "연차"])
+            in_val = st.text_input("내용", placeholder="시간(4, 8) 또는 메모")
+            force = st.checkbox("충돌이 있어도 저장", key="force_save")
+            
+            if st.form_submit_button("저장하기", type="primary", use_container_width=True):
+                save_val = in_val
+                if in_type == "당직" and not in_val: save_val = "22:00~"
+                
+                new_rec = {"name": sel_name, "type": in_type, "val": save_val}
+                if not range_mode:
+                    d_keys = [in_date.strftime("%Y-%m-%d")]
+                else:
+                    try:
+                        d_keys = batch_dates(in_start, in_end, {WEEKDAY_LABELS.index(d) for d in in_days},
+                                             sel_name if skip_rest else None, load_month_schedule)
+                    except ValueError as e:
+                        d_keys = None
+                        st.warning(str(e))
+                    if d_keys == []: st.warning("조건에 맞는 날짜가 없습니다.")
+                if d_keys:
+                    # 저장 전 충돌 점검 (같은 밤 당직 중복, 쉬는 날 연차 등)
+                    entries = [(d, dict(new_rec)) for d in d_keys]
+                    errors, warns = split_issues(check_entries(load_month_schedule, entries))
+                    if errors and not force:
+                        st.error("저장하지 않았습니다. 충돌:\n" + "\n".join(f"- {i.date} {i.message}" for i in errors[:10]))
+                    else:
+                        note = f" (주의 {len(errors) + len(warns)}건: {(errors + warns)[0].message})" if errors or warns else ""
+                        ok_msg = "클라우드에 저장되었습니다." if len(entries) == 1 else f"{len(entries)}일 기록을 클라우드에 저장했습니다."
+                        edit_add_records(entries, ok_msg + note)
+                        st.rerun()
+
+        st.divider()
+        st.write("🗑️ **최근 기록 삭제**")
+        pages_key = f"log_pages_{sel_name}"
+        ensure_member_index()
+        my_logs, has_more = load_member_logs(sel_name, st.session_state.get(pages_key, 1))
+
+        if not my_logs: st.info("기록이 없습니다.")
+        for log in my_logs:
+            with st.container(border=True):
+                col_info, col_btn = st.columns([4, 1])
+                type_icon = {"시간외": "⏰", "당직": "🌙", "연차": "🌴"}.get(log['type'], "📝")
+                disp_text = f"{type_icon} {log['type']} | {log['val']}"
+                with col_info:
+                    st.write(f"**{log['date']}**")
+                    st.caption(disp_text)
+                with col_btn:
+                    unique_key = f"logdel_{log['date']}_{log['id']}"
+                    st.button("삭제", key=unique_key, use_container_width=True, on_click=edit_delete_record,
+                              args=(log['date'], log['id'], {**log, 'name': sel_name}, "삭제 후 클라우드 저장 완료.", "이미 삭제된 항목입니다."))
+
+        if has_more:
+            def load_more():
+                st.session_state[pages_key] = st.session_state.get(pages_key, 1) + 1
+            st.button("⬇️ 이전 기록 더 보기", on_click=load_more, use_container_width=True)
+
+# 3. 연박자 보기 탭
+# 목록은 거른 결과를 HTML 한 덩어리로 그린다. 거르기 위젯은 fragment 안에 있어 이 부분만 다시 그린다.
+@st.fragment
+def stay_panel():
+    stay_data = get_data("stay_result")
+    if stay_data:
+        updated = stay_data.get("updated_at", "-")
+        st.info(f"🕒 업데이트: {updated}")
+        rows = stay_rows(stay_data)
+        if not rows: st.success("연박/이동 내역이 없습니다.")
+        else:
+            c1, c2 = st.columns(2)
+            kind = c1.radio("구분", [None, *STAY_KINDS], format_func=lambda k: STAY_KINDS.get(k, "전체"),
+                            horizontal=True, key="stay_kind", label_visibility="collapsed")
+            query = c2.text_input("사이트 번호 검색", key="stay_q", placeholder="🔍 사이트 번호", label_visibility="collapsed")
+            st.markdown(stay_html(filter_stay(rows, kind, query)), unsafe_allow_html=True)
+            st.caption("※ 데이터는 PC 프로그램에서 분석 후 자동 반영됩니다.")
+    else: st.warning("데이터가 없습니다. PC 프로그램에서 분석을 실행해주세요.")
+
+def render_stay_tab():
+    st.subheader("⛺ 연박 및 이동 현황")
+    stay_panel()
+
+# 4. 입실 현황 탭
+# PC 프로그램은 monitor_result 를 올린 뒤 result_versions/monitor_result/version 을 올린다. (admin.py publish-result)
+# 탭은 fragment 로 MONITOR_POLL_SEC 마다 이 작은 version 노드만 읽고, 바뀌었을 때만 전체 내용을 다시 받는다.
+# 받은 내용은 모든 세션이 함께 쓰므로 안내 데스크 태블릿 여러 대가 열어 두어도 version 하나에 한 번만 받는다.
+# (version 을 올리지 않는 예전 프로그램이면 monitor_result/updated_at 으로 바뀜을 판단한다)
+MONITOR_POLL_SEC = st.secrets["MONITOR_POLL_SEC"] if "MONITOR_POLL_SEC" in st.secrets else 30
+
+@st.cache_resource
+def get_result_store():
+    return {}  # node -> (version 토큰, 내용)
+
+def result_version(node):
+    meta = get_data(f"result_versions/{node}", cached=False)
+    if meta: return (meta.get("version"), meta.get("updated_at"))
+    return get_data(f"{node}/updated_at", cached=False)
+
+def load_result(node):
+    token = result_version(node)
+    store = get_result_store()
+    hit = store.get(node)
+    if hit and token is not None and hit[0] == token: return hit[1]
+    data = get_data(node, cached=False)
+    store[node] = (token, data)
+    return data
+
+@st.fragment(run_every=MONITOR_POLL_SEC)
+def monitor_panel():
+    mon_data = load_result("monitor_result")
+    if mon_data:
+        updated = mon_data.get("updated_at", "-")
+        st.caption(f"🕒 기준: {updated}")
+        summ = mon_data.get("summary", {})
+        col1, col2, col3 = st.columns(3)
+        col1.metric("총 예약", f"{summ.get('total',0)}건")
+        col2.metric("입실(파랑)", f"{summ.get('checkin',0)}건")
+        col3.metric("대기(초록)", f"{summ.get('nocheck',0)}건")
+        st.divider()
+        # 구역/상태/사이트 번호로 거른 카드를 구역별 HTML 한 덩어리로 그린다. (건수와 관계없이 요소 수가 같다)
+        cards = monitor_cards(mon_data)
+        c1, c2 = st.columns(2)
+        zones = c1.multiselect("구역", list(dict.fromkeys(c[0] for c in cards)), key="mon_zones",
+                               placeholder="전체 구역", label_visibility="collapsed")
+        status = c2.radio("상태", [None, *MONITOR_STATUS], format_func=lambda k: MONITOR_STATUS.get(k, "전체"),
+                          horizontal=True, key="mon_status", label_visibility="collapsed")
+        query = st.text_input("사이트 번호 검색", key="mon_q", placeholder="🔍 사이트 번호", label_visibility="collapsed")
+        st.markdown(monitor_html(filter_monitor(cards, zones, status, query)), unsafe_allow_html=True)
+    else: st.warning("데이터가 없습니다. PC 프로그램에서 분석을 실행해주세요.")
+
+def render_monitor_tab():
+    st.subheader("📊 예약 및 입실 현황")
+    monitor_panel()
+
+# 5. 분실물 탭
+# 등록/수령/삭제는 항목(lost_found/{id}), lost_index 의 상태/날짜 색인, 보관중 개수를 한 번의 multi-path update 로 쓴다.
+# 보관중 개수(lost_index/kept_count)는 서버에서 더하고, 아직 만들어지지 않았으면 그대로 두고 전체에서 센다.
+def kept_count_change(n):
+    if get_data("lost_index/kept_count") is None: return {}
+    return {"lost_index/kept_count": server_increment(n)}
+
+def lost_index_update(lid, item, remove=False):
+    return {f"lost_index/{k}": v for k, v in lost_index_changes(lid, item, remove).items()}
+
+def lost_add_changes(lid, item):
+    return {f"lost_found/{lid}": item, **lost_index_update(lid, item)}
+
+def add_lost(item, lid=None):
+    lid = lid or new_push_id()
+    update_data("", {**lost_add_changes(lid, item), **kept_count_change(1)})
+    return 0
+
+# 수령/삭제는 먼저 lost_found/{id}/status 를 트랜잭션으로 바꿔 항목을 차지한다. (보관중 -> 수령완료, 아무 상태 -> 삭제중)
+# 차지한 쪽만 색인을 옮기고 보관중 개수를 고치므로, 두 세션이 동시에 눌러도 보관중에서 바뀐 한 번만 뺀다.
+# 이미 처리됐으면 RecordMissing. 색인에 쓰는 나머지 필드는 화면에 보이는 항목(item)을 쓴다. 반환값은 (바꾸기 전 상태, 재시도 횟수)
+def claim_lost_status(lid, status, kept_only=False):
+    before = []
+    def fn(current):
+        if current is None or (kept_only and current != LOST_KEPT): raise RecordMissing(f"lost_found/{lid}")
+        before[:] = [current]
+        return status
+    retries = transact_data(f"lost_found/{lid}/status", fn)
+    return before[0], retries
+
+def mark_lost_returned(lid, item, today):
+    _, retries = claim_lost_status(lid, LOST_RETURNED, kept_only=True)
+    before, after = {**item, "status": LOST_KEPT}, {**item, "status": LOST_RETURNED, "return_date": today}
+    update_data("", {f"lost_found/{lid}/return_date": today,
+                     **lost_index_update(lid, before, remove=True), **lost_index_update(lid, after), **kept_count_change(-1)})
+    return retries
+
+def delete_lost(lid, item):
+    status, retries = claim_lost_status(lid, LOST_DELETING)
+    # 앞서 삭제하다 멈춘 항목(삭제중)이면 어느 색인에 남았는지 모르므로 두 상태의 색인을 모두 지운다.
+    index = {**lost_index_update(lid, {**item, "status": LOST_KEPT}, remove=True),
+             **lost_index_update(lid, {**item, "status": LOST_RETURNED}, remove=True)}
+    count = kept_count_change(-1) if status == LOST_KEPT else {}
+    update_data("", {f"lost_found/{lid}": None, **index, **count})
+    return retries
+
+# 화면에 보이는 항목과 지금 보이는 보관중 개수로 미리 반영하고 쓴다.
+def kept_count_preview(n):
+    cnt = get_data("lost_index/kept_count")
+    return {} if cnt is None else {"lost_index/kept_count": max(int(cnt) + n, 0)}
+
+def edit_add_lost(item):
+    lid = new_push_id()
+    run_edit(partial(add_lost, item, lid), "클라우드 저장 완료", preview={**lost_add_changes(lid, item), **kept_count_preview(1)})
+
+def edit_return_lost(lid, item):
+    today = datetime.now().strftime("%Y-%m-%d")
+    after = {**item, "status": LOST_RETURNED, "return_date": today}
+    preview = {f"lost_found/{lid}": after, **lost_index_update(lid, item, remove=True), **lost_index_update(lid, after),
+               **kept_count_preview(-1)}
+    run_edit(partial(mark_lost_returned, lid, item, today), "수령 처리 저장됨", "이미 수령 처리된 항목입니다.", preview=preview)
+
+def edit_delete_lost(lid, item):
+    preview = {f"lost_found/{lid}": None, **lost_index_update(lid, item, remove=True),
+               **(kept_count_preview(-1) if item.get('status') == LOST_KEPT else {})}
+    run_edit(partial(delete_lost, lid, item), "삭제 저장됨", "이미 삭제된 항목입니다.", preview=preview)
+
+def render_lost_tab():
+    st.subheader("🧢 분실물 센터")
+    
+    with st.expander("➕ 분실물 등록 (즉시 저장)", expanded=False):
+        c1, c2 = st.columns(2)
+        l_loc = c1.text_input("장소")
+        l_nm = c2.text_input("물건명")
+        if st.button("등록", use_container_width=True):
+            if l_loc and l_nm:
+                new_l = {"date": datetime.now().strftime("%Y-%m-%d"), "item": l_nm, "location": l_loc, "status": LOST_KEPT, "return_date": "-"}
+                edit_add_lost(new_l)
+                st.rerun()
+
+    pages = st.session_state.get("lost_pages", 1)
+    cnt, kept, returned, has_more = load_lost_view(pages)
+    st.markdown(f"**보관중: {cnt}개**")
+    for lid, item, is_kept, title, caption in lost_rows(kept) + lost_rows(returned):
+        with st.container(border=True):
+            c_txt, c_btn = st.columns([3, 1])
+            with c_txt:
+                st.write(title)
+                st.caption(caption)
+            with c_btn:
+                if is_kept: st.button("수령", key=f"rec_{lid}", on_click=edit_return_lost, args=(lid, item))
+                else: st.button("삭제", key=f"lostdel_{lid}", on_click=edit_delete_lost, args=(lid, item))
+
+    if has_more:
+        def load_more():
+            st.session_state.lost_pages = st.session_state.get("lost_pages", 1) + 1
+        st.button("⬇️ 수령 완료 항목 더 보기", on_click=load_more, use_container_width=True)
+
+# 6. 월 규칙 계획 탭
+# 교대 패턴을 N 개월 앞으로 펼쳐 미리보고, 한 번의 update 로 schedule/month_rules 에 저장한다.
+PLAN_PREVIEW_COLS = 2
+
+def weekday_names(days):
+    return [WEEKDAY_LABELS[d] for d in (days or []) if isinstance(d, int) and 0 <= d < 7]
+
+def render_plan_tab():
+    st.subheader("🗓️ 월 근무 규칙 계획")
+    cur = st.session_state.curr_date
+    base = get_data(f"schedule/month_rules/{cur.year}-{cur.month:02d}") or {}
+    teams = get_data("schedule/teams") or {}
+
+    c1, c2 = st.columns(2)
+    start = c1.date_input("시작 월", value=cur.replace(day=1), key="plan_start")
+    months = c2.number_input("개월 수", min_value=1, max_value=12, value=3, key="plan_months")
+    c3, c4 = st.columns(2)
+    start_team = c3.radio("첫 달 먼저 근무(A조)", ["1", "2"], index=1 if base.get("start_team") == "2" else 0,
+                          format_func=lambda t: f"{t}조", horizontal=True, key="plan_start_team")
+    alternate_team = c4.checkbox("달마다 시작 팀 교대", value=True, key="plan_alt_team")
+    c5, c6 = st.columns(2)
+    t1_off = c5.multiselect("1조 휴무 요일", WEEKDAY_LABELS, default=weekday_names(base.get("t1_off")), key="plan_t1_off")
+    t2_off = c6.multiselect("2조 휴무 요일", WEEKDAY_LABELS, default=weekday_names(base.get("t2_off")), key="plan_t2_off")
+    c7, c8 = st.columns(2)
+    rotation_type = c7.selectbox("교대 방식", list(ROTATION_TYPES), format_func=ROTATION_TYPES.get, key="plan_rotation",
+                                 index=list(ROTATION_TYPES).index(base.get("rotation_type")) if base.get("rotation_type") in ROTATION_TYPES else 0)
+    time_type = c8.selectbox("근무 시간", list(TIME_TYPES), format_func=TIME_TYPES.get, key="plan_time",
+                             index=list(TIME_TYPES).index(base.get("time_type")) if base.get("time_type") in TIME_TYPES else 0)
+    alternate_off = st.checkbox("달마다 1조/2조 휴무 요일 맞바꾸기", key="plan_alt_off")
+
+    plan = plan_month_rules(start.year, start.month, int(months), start_team,
+                            [WEEKDAY_LABELS.index(d) for d in t1_off], [WEEKDAY_LABELS.index(d) for d in t2_off],
+                            rotation_type, time_type, alternate_team, alternate_off)
+
+    prefetch_reads([r for k in plan for r in month_reads(int(k[:4]), int(k[5:7]))])
+    existing = [k for k in plan if get_data(f"schedule/month_rules/{k}")]
+    if existing: st.warning(f"이미 규칙이 있는 달은 덮어씁니다: {', '.join(existing)}")
+    if st.button(f"💾 {len(plan)}개월 규칙 저장", type="primary", use_container_width=True):
+        run_edit(partial(update_data, "schedule/month_rules", plan), f"{len(plan)}개월 규칙을 저장했습니다.",
+                 preview={f"schedule/month_rules/{k}": v for k, v in plan.items()})
+        st.rerun()
+
+    st.caption("미리보기: 8 = 08-17, 11 = 11-20, 9 = 09-18, · = 휴무 (등록된 휴무/당직 기록 반영)")
+    cols = st.columns(PLAN_PREVIEW_COLS)
+    for i, (month_key, rules) in enumerate(plan.items()):
+        y, m = int(month_key[:4]), int(month_key[5:7])
+        start_key, end_key = month_range_keys(y, m)
+        roster = month_roster(y, m, rules, teams, get_range("schedule/records", start_key, end_key) or {})
+        with cols[i % PLAN_PREVIEW_COLS]:
+            st.markdown(f"**{y}년 {m}월**")
+            st.markdown(roster_matrix_html(roster), unsafe_allow_html=True)
+
+# 7. 보고서 탭
+# 전체 records 를 한 번 펼친 표를 데이터 버전별로 모든 세션이 함께 쓰고, 기간 합계는 groupby 로 계산한다.
+@st.cache_resource
+def get_report_store():
+    return {}  # "frame" -> (데이터 버전, DataFrame)
+
+def records_data_version():
+    if edit_overlay(): return None
+    mirror = live_mirror()
+    if mirror: return ("live", mirror.version)
+    return get_cache().entry_version("schedule/records")
+
+def load_report_frame(pd):
+    records = get_data("schedule/records") or {}
+    version = records_data_version()
+    store = get_report_store()
+    hit = store.get("frame")
+    if hit and version is not None and hit[0] == version: return hit[1]
+    df = report.records_frame(pd, records)
+    if version is not None: store["frame"] = (version, df)
+    return df
+
+def render_report_tab():
+    st.subheader("📈 기간 보고서")
+    pd = report.load_pandas()
+    if pd is None:
+        st.warning("보고서를 만들려면 pandas 가 필요합니다. (pip install pandas)")
+        return
+    cur = st.session_state.curr_date
+    period = st.date_input("기간", value=(cur.replace(month=1, day=1).date(), cur.replace(month=12, day=31).date()), key="report_range")
+    if len(period) != 2:
+        st.info("끝 날짜를 선택하세요.")
+        return
+    start, end = period
+    df = report.period_frame(load_report_frame(pd), start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    if df.empty:
+        st.info("기간 안에 기록이 없습니다.")
+        return
+
+    totals = report.member_totals(df)
+    pivots = {m: report.member_month_pivot(df, m) for m in report.METRICS}
+    st.markdown("**직원별 합계**")
+    st.dataframe(totals, use_container_width=True)
+    metric = st.radio("월별 보기", list(report.METRICS), format_func=report.METRICS.get, horizontal=True, key="report_metric")
+    st.dataframe(pivots[metric], use_container_width=True)
+
+    base = f"보고서_{start:%Y%m%d}-{end:%Y%m%d}"
+    c1, c2 = st.columns(2)
+    c1.download_button("⬇️ CSV", report.report_csv(totals, pivots), file_name=f"{base}.csv", mime="text/csv", use_container_width=True)
+    if report.excel_available():
+        c2.download_button("⬇️ Excel", report.report_excel(pd, totals, pivots), file_name=f"{base}.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+
+# --- 화면 전환 ---
+# 기본(lazy)은 선택한 메뉴의 내용만 불러와 그린다. st.tabs 는 모든 탭을 매번 실행하므로
+# 예전 화면이 필요할 때만 secrets 에 NAV_MODE = "tabs" 로 설정한다.
+TAB_LABELS = ["📅 근무", "✍️ 수정", "⛺ 연박", "📊 현황", "🧢 분실", "🗓️ 계획", "📈 보고"]
+TAB_RENDERERS = [render_calendar_tab, render_my_tab, render_stay_tab, render_monitor_tab, render_lost_tab, render_plan_tab, render_report_tab]
+NAV_MODE = st.secrets["NAV_MODE"] if "NAV_MODE" in st.secrets else "lazy"
+
+# 메뉴별로 처음 그릴 때 읽는 노드 (입력값에 따라 달라지는 읽기는 각 화면에서 읽는다)
+def view_reads(label):
+    cur = st.session_state.curr_date
+    month_key = f"{cur.year}-{cur.month:02d}"
+    if label == "📅 근무": return month_reads(cur.year, cur.month)
+    if label == "✍️ 수정": return [read_key("schedule/teams"), read_key(f"schedule/summary/{month_key}"), read_key("schedule/member_index_built")]
+    if label == "⛺ 연박": return [read_key("stay_result")]
+    if label == "🧢 분실": return [read_key("lost_index/kept_count"), read_key("lost_index/kept"),
+                                 read_key("lost_index/returned", limit=LOST_PAGE_SIZE)]
+    if label == "🗓️ 계획": return [read_key("schedule/teams"), read_key(f"schedule/month_rules/{month_key}")]
+    if label == "📈 보고": return [read_key("schedule/records")]
+    return []
+
+if NAV_MODE == "tabs":
+    prefetch_reads([r for label in TAB_LABELS for r in view_reads(label)])
+    for label, tab, render in zip(TAB_LABELS, st.tabs(TAB_LABELS), TAB_RENDERERS):
+        with tab, perf.span("tab", label): render()
+else:
+    sel_tab = st.radio("메뉴", TAB_LABELS, horizontal=True, key="nav_tab", label_visibility="collapsed")
+    prefetch_reads(view_reads(sel_tab))
+    with perf.span("tab", sel_tab): TAB_RENDERERS[TAB_LABELS.index(sel_tab)]()
+
+# --- 성능 측정 결과 ---
+trace = perf.current()
+if trace:
+    with st.sidebar, st.expander("⏱️ 성능 측정 (이번 실행)"):
+        totals = trace.totals()
+        st.caption(f"전체 {totals['total_ms']:.0f}ms · DB 왕복 {totals['db_calls']}회 "
+                   f"{totals['db_ms']:.0f}ms · {totals['db_bytes'] / 1024:.1f}KB")
+        st.dataframe(trace.rows(), use_container_width=True, hide_index=True)
+    if PERF_LOG:
+        with open(PERF_LOG, "a", encoding="utf-8") as f:
+            f.write(trace.to_json(timestamp=datetime.now().isoformat(timespec="seconds"),
+                                  tab=st.session_state.get("nav_tab"), nav=NAV_MODE) + "\n")
@@ -0,0 +1,254 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from roster import plan_month_rules, month_roster, normalize_data, month_range_keys, get_auto_duty_members, build_calendar_html, monthly_totals, member_logs, roster_for, clear_roster_cache, build_summary, build_member_index, index_logs
+from datastore import last_keys
+from model import records_model, clear_model_cache
+from export import iter_export, ics_chunks, csv_chunks
+import report
+from validate import audit_months, check_entries
+from lost_found import lost_item_list, lost_rows, kept_count, build_lost_index
+
+# ==========================================
+# ⏱️ 벤치마크 (합성 schedule 데이터)
+# ==========================================
+# 사용 예)
+#   python bench.py                              # 기본 규모, 결과를 JSON 줄로 출력
+#   python bench.py --years 5 --lost 10000 --out bench_results.jsonl
+#   python bench.py --snapshot local_db.json     # 생성한 데이터를 저장 (DATA_BACKEND="json" 으로 앱 실행 가능)
+# 결과는 한 줄에 벤치마크 하나씩 JSON 으로 남기므로 --out 파일에 계속 쌓아 추이를 비교한다.
+
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+GIVEN = ["민수", "영희", "철수", "지우", "서연", "도윤", "하은", "준호", "수빈", "현우", "예린", "태민"]
+ROTATIONS = ["fixed", "biweekly", "two_weeks"]
+OFF_PATTERNS = [([5, 6], [0, 1]), ([4, 5], [6, 0]), ([6], [0]), ([], [])]
+OT_VALS = ["1", "2", "3", "4", "1.5", "2.5", "4 (행사)", "야간 3"]
+LOST_ITEMS = ["모자", "지갑", "텀블러", "우산", "휴대폰", "충전기", "캠핑의자", "랜턴", "아이 신발", "선글라스"]
+LOST_LOCS = ["A구역", "B구역", "C구역", "D구역", "E구역", "F구역", "관리동", "샤워장", "주차장"]
+
+
+def make_names(count, rnd, used):
+    names = []
+    while len(names) < count:
+        name = rnd.choice(SURNAMES) + rnd.choice(GIVEN)
+        if name in used: name += str(len(used))
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def iter_months(start, months):
+    y, m = start.year, start.month
+    for _ in range(months):
+        yield y, m
+        m += 1
+        if m > 12: y, m = y + 1, 1
+
+
+def generate_schedule(team1=4, team2=4, years=3, lost=5000, end=None, seed=0):
+    # yuldong_data 아래와 같은 모양의 트리를 만든다. (records 는 앱처럼 날짜별 리스트)
+    rnd = random.Random(seed)
+    end = end or datetime.now()
+    months = years * 12
+    start = datetime(end.year, end.month, 1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+
+    used = set()
+    t1, t2 = make_names(team1, rnd, used), make_names(team2, rnd, used)
+    members = t1 + t2
+
+    month_rules, records = {}, {}
+    for i, (y, m) in enumerate(iter_months(start, months)):
+        off1, off2 = OFF_PATTERNS[i % len(OFF_PATTERNS)]
+        month_rules[f"{y}-{m:02d}"] = {
+            "start_team": "1" if i % 2 == 0 else "2",
+            "t1_off": off1, "t2_off": off2,
+            "time_type": "unified" if i % 5 == 4 else "split",
+            "rotation_type": ROTATIONS[i % len(ROTATIONS)],
+        }
+
+    day = start
+    last = (datetime(end.year, end.month, 28) + timedelta(days=4)).replace(day=1)  # 다음 달 1일
+    night_idx, prev_night = 0, None
+    while day < last:
+        recs = []
+        night = members[night_idx % len(members)]
+        night_idx += 1
+        recs.append({"name": night, "type": "당직", "val": "22:00~"})
+        if prev_night and rnd.random() < 0.8:
+            recs.append({"name": prev_night, "type": "당직휴무", "val": ""})
+        for name in members:
+            r = rnd.random()
+            if r < 0.03: recs.append({"name": name, "type": "연차", "val": rnd.choice(["8", "4", "2"])})
+            elif r < 0.11: recs.append({"name": name, "type": "시간외", "val": rnd.choice(OT_VALS)})
+            elif r < 0.12: recs.append({"name": name, "type": "휴무", "val": "모바일제외"})
+            elif r < 0.13 and day.weekday() >= 5: recs.append({"name": name, "type": "특별근무", "val": ""})
+        if rnd.random() < 0.01:
+            for name in rnd.choice([t1, t2]):
+                recs.append({"name": name, "type": "팀휴무", "val": ""})
+        records[day.strftime("%Y-%m-%d")] = recs
+        prev_night = night
+        day += timedelta(days=1)
+
+    lost_found = []
+    span = (last - start).days
+    for i in range(lost):
+        reg = start + timedelta(days=span * i // max(lost, 1))
+        kept = rnd.random() < 0.05 or i >= lost - 20
+        lost_found.append({
+            "date": reg.strftime("%Y-%m-%d"),
+            "item": rnd.choice(LOST_ITEMS),
+            "location": rnd.choice(LOST_LOCS),
+            "status": "보관중" if kept else "수령완료",
+            "return_date": "-" if kept else (reg + timedelta(days=rnd.randint(0, 10))).strftime("%Y-%m-%d"),
+        })
+
+    return {
+        "schedule": {"records": records, "teams": {"1": t1, "2": t2}, "month_rules": month_rules},
+        "lost_found": lost_found,
+    }
+
+
+def month_schedule(schedule, year, month):
+    # app.load_month_schedule 과 같은 범위만 잘라낸다.
+    start_key, end_key = month_range_keys(year, month)
+    month_key = f"{year}-{month:02d}"
+    records = {k: v for k, v in schedule["records"].items() if start_key <= k <= end_key}
+    return {"records": records, "teams": schedule["teams"],
+            "month_rules": {month_key: schedule["month_rules"].get(month_key, {})}}
+
+
+def time_it(fn, repeat):
+    fn()  # 워밍업
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_cases(tree, year, month):
+    schedule = tree["schedule"]
+    records = schedule["records"]
+    month_sch = month_schedule(schedule, year, month)
+    month_prefix = f"{year}-{month:02d}"
+    name = schedule["teams"]["1"][0]
+    lost_items = tree["lost_found"]
+    days = [datetime(year, month, d) for d in range(1, 29)]
+    member_index = build_member_index(records)[name]
+    lost_index = build_lost_index(lost_items)
+    export_start, export_end = datetime(year - 1, month, 1), datetime(year, month, 1) - timedelta(days=1)
+
+    cases = {
+        "normalize_data": lambda: (normalize_data(records), normalize_data(lost_items)),
+        "month_roster_cold": lambda: (clear_roster_cache(), roster_for(year, month, month_sch)),
+        # 근무표 캐시를 비우고 재야 캐시 조회가 아닌 근무 계산(compute_month_roster)을 잰다.
+        "get_auto_duty_members_month": lambda: (clear_roster_cache(), [get_auto_duty_members(d, month_sch) for d in days]),
+        "get_auto_duty_members_full_history": lambda: (clear_roster_cache(), [get_auto_duty_members(d, schedule) for d in days]),
+        "month_rules_plan_preview_12_cold": lambda: (clear_roster_cache(), [
+            month_roster(int(k[:4]), int(k[5:7]), rules, schedule["teams"], {})
+            for k, rules in plan_month_rules(year, month, 12, "1", [5, 6], [0, 1], "biweekly").items()]),
+        "draw_calendar_html_cold": lambda: (clear_roster_cache(), build_calendar_html(year, month, month_sch, None)),
+        "draw_calendar_html": lambda: build_calendar_html(year, month, month_sch, None),
+        "draw_calendar_html_filtered": lambda: build_calendar_html(year, month, month_sch, name),
+        "monthly_totals_month": lambda: monthly_totals(normalize_data(month_sch["records"]), name, month_prefix),
+        "monthly_totals_full_history": lambda: monthly_totals(records, name, month_prefix),
+        "records_model_cold": lambda: (clear_model_cache(), records_model(records)),
+        "build_summary_full_history": lambda: build_summary(records),
+        "build_summary_full_history_cold": lambda: (clear_model_cache(), build_summary(records)),
+        "member_logs_sort": lambda: member_logs(records, name)[:10],
+        "member_index_page": lambda: index_logs(last_keys(member_index, 10)),
+        "export_ics_year_all_cold": lambda: (clear_roster_cache(), sum(len(c) for c in ics_chunks(
+            iter_export(lambda y, m: month_schedule(schedule, y, m), export_start, export_end)))),
+        "export_csv_year_member": lambda: sum(len(c) for c in csv_chunks(
+            iter_export(lambda y, m: month_schedule(schedule, y, m), export_start, export_end, name))),
+        "audit_year_cold": lambda: (clear_roster_cache(), audit_months(lambda y, m: month_schedule(schedule, y, m), export_start, export_end)),
+        "check_entries_month_batch": lambda: check_entries(lambda y, m: month_sch, [(d.strftime("%Y-%m-%d"), {"name": name, "type": "연차", "val": "8"}) for d in days]),
+        "lost_found_rows": lambda: (kept_count(lost_item_list(lost_items)), lost_rows(lost_item_list(lost_items))),
+        "lost_index_build": lambda: build_lost_index(lost_items),
+        "lost_found_page": lambda: lost_rows(lost_item_list(lost_index["kept"])) + lost_rows(lost_item_list(last_keys(lost_index["returned"], 20))),
+    }
+    pd = report.load_pandas()  # pandas 가 없으면 보고서 벤치마크는 건너뛴다
+    if pd is not None:
+        frame = report.records_frame(pd, records)
+        year_df = lambda: report.period_frame(frame, f"{year}-01-01", f"{year}-12-31")
+        cases["report_frame_full_history"] = lambda: report.records_frame(pd, records)
+        cases["report_year_pivots"] = lambda: (report.member_totals(year_df()),
+                                               [report.member_month_pivot(year_df(), m) for m in report.METRICS])
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="율동공원 모바일 핫패스 벤치마크")
+    parser.add_argument("--team1", type=int, default=4)
+    parser.add_argument("--team2", type=int, default=4)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--lost", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", action="append", help="이 이름이 들어간 벤치마크만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--out", help="결과 JSON 줄을 덧붙일 파일")
+    parser.add_argument("--snapshot", help="생성한 데이터를 Firebase 내보내기 형식 JSON 으로 저장")
+    args = parser.parse_args(argv)
+
+    tree = generate_schedule(args.team1, args.team2, args.years, args.lost, seed=args.seed)
+    if args.snapshot:
+        with open(args.snapshot, "w", encoding="utf-8") as f:
+            json.dump({"yuldong_data": tree}, f, ensure_ascii=False)
+
+    last_key = max(tree["schedule"]["records"])
+    year, month = int(last_key[:4]), int(last_key[5:7])
+    records = tree["schedule"]["records"]
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git": git_rev(),
+        "python": platform.python_version(),
+        "params": {k: getattr(args, k) for k in ["team1", "team2", "years", "lost", "repeat", "seed"]},
+        "sizes": {
+            "record_days": len(records),
+            "records": sum(len(v) for v in records.values()),
+            "records_bytes": len(json.dumps(records, ensure_ascii=False).encode("utf-8")),
+            "lost_found": len(tree["lost_found"]),
+        },
+        "month": f"{year}-{month:02d}",
+    }
+
+    results = []
+    for name, fn in build_cases(tree, year, month).items():
+        if args.only and not any(o in name for o in args.only): continue
+        samples = time_it(fn, args.repeat)
+        results.append({
+            "bench": name, **meta,
+            "min_ms": round(min(samples), 4),
+            "median_ms": round(statistics.median(samples), 4),
+            "mean_ms": round(statistics.fmean(samples), 4),
+            "runs": len(samples),
+        })
+
+    lines = [json.dumps(r, ensure_ascii=False) for r in results]
+    if args.out:
+        with open(args.out, "a", encoding="utf-8") as f:
+            for line in lines: f.write(line + "\n")
+    for line in lines: print(line)
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
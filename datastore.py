@@ -0,0 +1,570 @@
+from concurrent.futures import wait
+import copy
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+
+# ==========================================
+# 💾 데이터 캐시 (모든 세션 공유)
+# ==========================================
+# Streamlit 은 위젯을 누를 때마다 app.py 를 처음부터 다시 실행하므로
+# 같은 경로를 여러 번 get() 하지 않도록 경로별 스냅샷을 메모리에 보관한다.
+# - TTL 이 지나면 다시 불러온다.
+# - set_data 로 쓰는 경로의 상위/하위 경로 캐시는 즉시 무효화한다.
+# - 키 범위 조회(start~end, 끝에서 limit 개)는 따로 보관하고, 범위 밖의 하위 키에 쓸 때는 유지한다.
+# - 반환값은 여러 세션이 함께 보므로 읽기 전용으로 취급해야 한다.
+
+
+def clean_path(path):
+    return "/".join(p for p in str(path).split("/") if p)
+
+
+def paths_overlap(a, b):
+    # 같은 경로이거나 한쪽이 다른 쪽의 상위 경로이면 겹친다.
+    if not a or not b: return True
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def entry_affected(key, written):
+    # key = (path, start, end, limit), written = 쓰기가 일어난 경로
+    # limit 조회도 end 이하 키에서만 고르므로 같은 범위 판정으로 충분하다.
+    path, start, end = key[:3]
+    if not paths_overlap(path, written): return False
+    if start is None and end is None: return True
+    if not written.startswith(path + "/"): return True
+    child = key_order(written[len(path) + 1:].split("/")[0])
+    if start is not None and child < key_order(start): return False
+    if end is not None and child > key_order(end): return False
+    return True
+
+
+class SnapshotCache:
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}      # (path, start, end, limit) -> (data, loaded_at, version)
+        self._loading = {}      # (path, start, end, limit) -> Lock (같은 키 동시 로드 방지)
+        self._version = 0       # 새 스냅샷이 저장될 때마다 증가
+        self._generation = 0    # 무효화될 때마다 증가
+
+    @property
+    def version(self):
+        return self._version
+
+    def entry_version(self, path, start=None, end=None, limit=None):
+        ent = self._entries.get((clean_path(path), start, end, limit))
+        return ent[2] if ent else None
+
+    def is_fresh(self, path, start=None, end=None, limit=None):
+        return self._fresh((clean_path(path), start, end, limit)) is not None
+
+    def _fresh(self, key):
+        ent = self._entries.get(key)
+        if ent and time.monotonic() - ent[1] < self.ttl: return ent
+        return None
+
+    def get(self, path, loader, start=None, end=None, limit=None):
+        key = (clean_path(path), start, end, limit)
+        ent = self._fresh(key)
+        if ent: return ent[0]
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # 다른 세션이 같은 경로를 불러오는 중이면 기다렸다가 그 결과를 쓴다.
+        with key_lock:
+            ent = self._fresh(key)
+            if ent: return ent[0]
+
+            generation = self._generation
+            loaded_at = time.monotonic()
+            data = loader()
+            with self._lock:
+                # 불러오는 동안 쓰기가 있었다면 오래된 값일 수 있으므로 저장하지 않는다.
+                if generation == self._generation:
+                    self._version += 1
+                    self._entries[key] = (data, loaded_at, self._version)
+        return data
+
+    def invalidate(self, path=None):
+        with self._lock:
+            self._generation += 1
+            if path is None:
+                self._entries.clear()
+                return
+            path = clean_path(path)
+            for key in [k for k in self._entries if entry_affected(k, path)]:
+                del self._entries[key]
+
+    # 쓴 값을 캐시 항목에 바로 반영한다. (쓰기 뒤에 다시 불러오지 않도록. 반영할 수 없는 limit 조회만 지운다)
+    # changes 의 키는 path 기준 상대 경로 ("" 이면 path 자체), 값이 None 이면 삭제. 항목 데이터는 바뀐 경로만 복사해 교체한다.
+    # 서버 값(increment)은 결과를 모르므로 그 경로의 항목은 지운다.
+    def patch(self, path, changes):
+        with self._lock:
+            self._generation += 1
+            for key, value in changes.items():
+                written = clean_path(f"{path}/{key}")
+                for ekey in [k for k in self._entries if entry_affected(k, written)]:
+                    epath, start, end, limit = ekey
+                    data, loaded_at, _ = self._entries[ekey]
+                    if limit is not None or is_server_value(value):
+                        del self._entries[ekey]
+                        continue
+                    self._version += 1
+                    self._entries[ekey] = (patch_entry(ekey, data, written, value), loaded_at, self._version)
+
+
+# 캐시 키 모양 (path, start, end, limit) 의 데이터에 written 경로에 쓴 value 를 반영한 새 데이터 (data 는 고치지 않는다)
+# limit 조회는 반영한 뒤 다시 마지막 limit 개를 고른다. (지운 만큼 앞 항목을 채우지는 못한다)
+def patch_entry(key, data, written, value):
+    path, start, end, limit = key
+    if written != path and (not path or written.startswith(path + "/")):
+        # 항목 경로 아래에 쓴 값 (ROOT 항목 "" 이면 쓴 경로 전체가 상대 경로)
+        data = replace_at(data, split_path(written[len(path):]), value)
+    else:
+        data = node_at(value, path[len(written):]) if value is not None else None
+    if limit is not None: return last_keys(data, limit, end)
+    if start is not None or end is not None: return key_range(data, start, end)
+    return data
+
+# 공유 캐시/미러에서 읽은 값에 한 세션만 보는 변경 {ROOT 기준 경로: 값} 을 순서대로 덧씌운다.
+def overlay_read(key, data, overlay):
+    for written, value in overlay.items():
+        written = clean_path(written)
+        if entry_affected(key, written): data = patch_entry(key, data, written, value)
+    return data
+
+
+# 캐시 키 모양의 읽기 목록 [(path, start, end, limit), ...] 을 스레드 풀에서 동시에 불러 캐시에 채운다.
+# HTTPS 왕복을 하나씩 기다리지 않고 가장 느린 하나만큼만 기다린다. 화면은 평소처럼 캐시에서 읽는다.
+# timeout 안에 끝나지 않은 읽기는 기다리지 않는다. (같은 키를 화면이 읽으면 캐시의 키 잠금에서 그 결과를 기다린다)
+# 실패한 읽기는 무시한다. 화면이 다시 읽으면서 오류를 그대로 보게 된다.
+def read_loader(backend, path, start=None, end=None, limit=None):
+    if limit is not None: return lambda: backend.get_last(path, limit, end)
+    if start is not None or end is not None: return lambda: backend.get_range(path, start, end)
+    return lambda: backend.get(path)
+
+
+def prefetch(cache, backend, reads, executor, timeout=5, wrap=None):
+    # (끝난 읽기 수, 기다리다 만 읽기 수). wrap 은 작업 스레드에서 실행할 함수를 감싼다. (성능 기록 연결 등)
+    futures = []
+    for path, start, end, limit in dict.fromkeys(reads):
+        if cache.is_fresh(path, start, end, limit): continue
+        job = lambda path=path, start=start, end=end, limit=limit: cache.get(
+            path, read_loader(backend, path, start, end, limit), start=start, end=end, limit=limit)
+        futures.append(executor.submit(wrap(job) if wrap else job))
+    if not futures: return 0, 0
+    done, pending = wait(futures, timeout=timeout)
+    return len(done), len(pending)
+
+
+# ==========================================
+# 📡 실시간 미러 (Reference.listen)
+# ==========================================
+# yuldong_data 전체를 리스너로 받아 프로세스 메모리에 최신 상태로 유지한다.
+# - put/patch 이벤트를 트리에 바로 반영하고, 반영할 때마다 version 을 올린다.
+# - 트리는 바뀐 경로만 복사해서 통째로 교체하므로 읽는 쪽은 잠금 없이 읽는다.
+# - 첫 전체 put 을 받기 전이거나 스트림이 끊기면 is_live() 가 False 가 되어
+#   기존 조회 경로(get/캐시)로 돌아간다.
+
+
+def split_path(path):
+    return [p for p in str(path).split("/") if p]
+
+
+def firebase_shape(node):
+    # Firebase 는 키가 모두 정수이고 절반 이상 채워진 객체를 배열로 돌려준다.
+    if not isinstance(node, dict) or not node: return node
+    if not all(isinstance(k, str) and k.isdigit() for k in node): return node
+    max_idx = max(int(k) for k in node)
+    if len(node) * 2 <= max_idx + 1: return node
+    arr = [None] * (max_idx + 1)
+    for k, v in node.items(): arr[int(k)] = v
+    return arr
+
+
+def as_dict(node):
+    if isinstance(node, list): return {str(i): v for i, v in enumerate(node) if v is not None}
+    return node if isinstance(node, dict) else {}
+
+
+def node_at(tree, path):
+    node = tree
+    for part in split_path(path):
+        if isinstance(node, list):
+            node = node[int(part)] if part.isdigit() and int(part) < len(node) else None
+        elif isinstance(node, dict):
+            node = node.get(part)
+        else:
+            return None
+        if node is None: return None
+    return node
+
+
+def replace_at(node, parts, value):
+    # node 를 직접 고치지 않고 parts 경로만 복사한 새 트리를 돌려준다.
+    if not parts: return value if value != {} else None
+    new = dict(as_dict(node))
+    child = replace_at(new.get(parts[0]), parts[1:], value)
+    if child is None: new.pop(parts[0], None)
+    else: new[parts[0]] = child
+    return firebase_shape(new) if new else None
+
+
+# Firebase 의 키 순서: 32비트 정수로 읽히는 키가 먼저 (숫자 순), 나머지는 문자열 순 ("9" < "10" < "-Nabc")
+INT_KEY_RE = re.compile(r"-?(0|[1-9][0-9]*)")
+
+def key_order(key):
+    key = str(key)
+    if INT_KEY_RE.fullmatch(key) and -2 ** 31 <= int(key) < 2 ** 31: return (0, int(key), "")
+    return (1, 0, key)
+
+
+def key_range(node, start=None, end=None):
+    items = as_dict(node)
+    lo = key_order(start) if start is not None else None
+    hi = key_order(end) if end is not None else None
+    return {k: items[k] for k in sorted(items, key=key_order)
+            if (lo is None or key_order(k) >= lo) and (hi is None or key_order(k) <= hi)}
+
+
+def last_keys(node, limit, end=None):
+    # 키 순서로 end 이하의 마지막 limit 개 (order_by_key().end_at(end).limit_to_last(limit))
+    items = key_range(node, None, end)
+    return {k: items[k] for k in list(items)[-limit:]} if limit > 0 else {}
+
+
+# Firebase 서버 값. update 에 넣으면 쓰는 순간의 서버 값에 n 을 더한다. (읽고 쓰는 트랜잭션 없이 개수 고치기)
+def server_increment(n):
+    return {".sv": {"increment": n}}
+
+def is_server_value(value):
+    return isinstance(value, dict) and ".sv" in value
+
+def resolve_server_value(current, value):
+    inc = value[".sv"].get("increment") if isinstance(value[".sv"], dict) else None
+    if not isinstance(inc, (int, float)): raise ValueError(f"지원하지 않는 서버 값입니다: {value}")
+    return (current if isinstance(current, (int, float)) and not isinstance(current, bool) else 0) + inc
+
+
+class LiveMirror:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tree = None
+        self._version = 0
+        self._ready = False
+        self._registration = None
+        self._last_attempt = None
+        self.last_event_at = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def ensure_started(self, listen, retry_after=30):
+        # listen(callback) -> ListenerRegistration (예: db.reference('yuldong_data').listen)
+        if self.is_live(): return True
+        if self._stream_alive(): return False   # 첫 전체 데이터를 받는 중
+        now = time.monotonic()
+        if self._last_attempt is not None and now - self._last_attempt < retry_after: return False
+        self._last_attempt = now
+        self.stop()
+        try:
+            self._registration = listen(self._on_event)
+        except Exception:
+            self._registration = None
+        return self.is_live()
+
+    def stop(self):
+        reg, self._registration = self._registration, None
+        self._ready = False
+        if reg is not None:
+            try: reg.close()
+            except Exception: pass
+
+    def _stream_alive(self):
+        if self._registration is None: return False
+        # 스트림이 끊기면 SDK 의 리스너 스레드가 종료된다.
+        thread = getattr(self._registration, "_thread", None)
+        return thread is None or thread.is_alive()
+
+    def is_live(self):
+        return self._ready and self._stream_alive()
+
+    def _on_event(self, event):
+        if event.event_type == "put":
+            self.apply(event.path, event.data)
+            if not split_path(event.path): self._ready = True
+        elif event.event_type == "patch":
+            self.apply_patch(event.path, event.data or {})
+
+    def apply(self, path, data):
+        with self._lock:
+            self._tree = replace_at(self._tree, split_path(path), data)
+            self._version += 1
+            self.last_event_at = time.time()
+
+    def apply_patch(self, path, changes):
+        # 서버 값은 리스너 이벤트로 계산된 값이 오므로 건너뛴다.
+        with self._lock:
+            base = split_path(path)
+            tree = self._tree
+            for key, value in changes.items():
+                if is_server_value(value): continue
+                tree = replace_at(tree, base + split_path(key), value)
+            self._tree = tree
+            self._version += 1
+            self.last_event_at = time.time()
+
+    def get(self, path):
+        return node_at(self._tree, path)
+
+    def get_range(self, path, start, end):
+        return key_range(self.get(path), start, end)
+
+    def get_last(self, path, limit, end=None):
+        return last_keys(self.get(path), limit, end)
+
+
+# ==========================================
+# 🗄️ 저장소 백엔드
+# ==========================================
+# get_data/set_data 가 바로 db.reference 를 부르지 않고 아래 인터페이스를 거친다.
+# 경로는 모두 ROOT(yuldong_data) 기준 상대 경로다.
+#   get(path) / set(path, data) / update(path, {"a/b": v, ...}) / delete(path)
+#   get_range(path, start, end)      : 키 순서 범위 조회 (양 끝 포함)
+#   get_last(path, limit, end)       : 키 순서로 end 이하 마지막 limit 개
+#   transaction(path, fn)            : fn(현재값) -> 새값, (새값, 재시도 횟수) 반환. 새값이 None 이면 ValueError (Firebase 와 같이 지울 수 없다)
+#   listen(callback)                 : ROOT 의 put/patch 이벤트 (LiveMirror 용)
+# 로컬 백엔드는 Firebase 없이 프로파일링/부하 테스트를 하기 위한 것이다.
+
+ROOT = "yuldong_data"
+TRANSACTION_MAX_RETRIES = 25
+
+
+class TransactionAborted(Exception):
+    pass
+
+
+class FirebaseBackend:
+    def __init__(self, root=ROOT):
+        from firebase_admin import db
+        self._db = db
+        self.root = root
+
+    def _ref(self, path):
+        return self._db.reference("/".join(p for p in [self.root, clean_path(path)] if p))
+
+    def get(self, path):
+        return self._ref(path).get()
+
+    def set(self, path, data):
+        self._ref(path).set(data)
+
+    def update(self, path, changes):
+        self._ref(path).update(changes)
+
+    def delete(self, path):
+        self._ref(path).delete()
+
+    def get_range(self, path, start, end):
+        query = self._ref(path).order_by_key()
+        if start is not None: query = query.start_at(start)
+        if end is not None: query = query.end_at(end)
+        return query.get()
+
+    def get_last(self, path, limit, end=None):
+        query = self._ref(path).order_by_key()
+        if end is not None: query = query.end_at(end)
+        return query.limit_to_last(limit).get()
+
+    def transaction(self, path, fn):
+        attempts = []
+        def counted(current):
+            attempts.append(1)
+            return fn(current)
+        try:
+            new_value = self._ref(path).transaction(counted)
+        except self._db.TransactionAbortedError as e:
+            raise TransactionAborted(str(e))
+        return new_value, len(attempts) - 1
+
+    def listen(self, callback):
+        return self._ref("").listen(callback)
+
+
+class MemoryEvent:
+    def __init__(self, event_type, path, data):
+        self.event_type = event_type
+        self.path = path
+        self.data = data
+
+
+class MemoryRegistration:
+    def __init__(self, backend, callback):
+        self._backend = backend
+        self._callback = callback
+
+    def close(self):
+        self._backend._listeners.discard(self)
+
+
+class MemoryBackend:
+    # 프로세스 메모리의 트리 하나를 Firebase 처럼 다룬다. (세션 간 공유, 잠금으로 직렬화)
+    def __init__(self, tree=None, root=ROOT):
+        self.root = root
+        self._lock = threading.RLock()
+        self._tree = firebase_shape_tree(tree or {})
+        self._listeners = set()
+
+    def _full(self, path):
+        return split_path(self.root) + split_path(path)
+
+    def _read(self, path):
+        return node_at(self._tree, "/".join(self._full(path)))
+
+    def _write(self, path, data):
+        self._tree = replace_at(self._tree, self._full(path), data) or {}
+
+    def _emit(self, event_type, path, data):
+        event = MemoryEvent(event_type, "/" + clean_path(path), copy.deepcopy(data))
+        for reg in list(self._listeners):
+            reg._callback(event)
+
+    def get(self, path):
+        with self._lock:
+            return copy.deepcopy(self._read(path))
+
+    def set(self, path, data):
+        data = to_json_value(data)
+        with self._lock:
+            self._write(path, data)
+            self._emit("put", path, data)
+            self._saved()
+
+    def update(self, path, changes):
+        if not changes or not isinstance(changes, dict):
+            raise ValueError("update 에는 비어 있지 않은 dict 가 필요합니다.")
+        changes = {k: to_json_value(v) for k, v in changes.items()}
+        with self._lock:
+            for key, value in changes.items():
+                target = f"{clean_path(path)}/{clean_path(key)}"
+                if is_server_value(value): changes[key] = value = resolve_server_value(self._read(target), value)
+                self._write(target, value)
+            self._emit("patch", path, changes)
+            self._saved()
+
+    def delete(self, path):
+        self.set(path, None)
+
+    def get_range(self, path, start, end):
+        with self._lock:
+            return copy.deepcopy(key_range(self._read(path), start, end))
+
+    def get_last(self, path, limit, end=None):
+        with self._lock:
+            return copy.deepcopy(last_keys(self._read(path), limit, end))
+
+    def transaction(self, path, fn):
+        # Firebase 와 같이 읽은 값이 바뀌었으면 fn 을 다시 불러 재시도한다.
+        for retries in range(TRANSACTION_MAX_RETRIES):
+            with self._lock:
+                current = copy.deepcopy(self._read(path))
+                etag = content_etag(current)
+            new_value = fn(current)
+            if new_value is None: raise ValueError("Value must not be none.")
+            new_value = to_json_value(new_value)
+            with self._lock:
+                if content_etag(self._read(path)) == etag:
+                    self._write(path, new_value)
+                    self._emit("put", path, new_value)
+                    self._saved()
+                    return new_value, retries
+        raise TransactionAborted("Transaction aborted after failed retries.")
+
+    def listen(self, callback):
+        reg = MemoryRegistration(self, callback)
+        with self._lock:
+            self._listeners.add(reg)
+            callback(MemoryEvent("put", "/", copy.deepcopy(self._read(""))))
+        return reg
+
+    def snapshot(self):
+        with self._lock:
+            return copy.deepcopy(self._tree)
+
+    def _saved(self):
+        pass
+
+
+class JsonFileBackend(MemoryBackend):
+    # Firebase 콘솔의 JSON 내보내기 파일을 그대로 읽고, 쓸 때마다 파일에 저장한다.
+    def __init__(self, filename, root=ROOT):
+        self.filename = filename
+        super().__init__(load_json_tree(filename), root=root)
+
+    def _saved(self):
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._tree, f, ensure_ascii=False)
+        os.replace(tmp, self.filename)
+
+
+def load_json_tree(filename):
+    if not filename or not os.path.exists(filename): return {}
+    with open(filename, encoding="utf-8") as f: return json.load(f)
+
+
+def to_json_value(data):
+    # 네트워크를 거친 것처럼 JSON 으로 바꿨다가 되돌린다. (튜플/숫자 키 등 정규화)
+    if data is None: return None
+    return json.loads(json.dumps(data, ensure_ascii=False))
+
+
+def content_etag(data):
+    return hashlib.md5(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def firebase_shape_tree(node):
+    if isinstance(node, list): node = as_dict(node)
+    if not isinstance(node, dict): return node
+    out = {k: firebase_shape_tree(v) for k, v in node.items() if v is not None and v != {}}
+    return firebase_shape(out)
+
+
+# Firebase push 키와 같은 형식의 id (앞 8자리는 시각, 같은 ms 안에서도 순서대로 커진다)
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+_push_lock = threading.Lock()
+_push_last = [0, [0] * 12]
+
+
+def new_push_id():
+    with _push_lock:
+        now = int(time.time() * 1000)
+        if now <= _push_last[0]:
+            now = _push_last[0]
+            rand = list(_push_last[1])
+            i = 11
+            while i >= 0 and rand[i] == 63:
+                rand[i] = 0
+                i -= 1
+            if i >= 0: rand[i] += 1
+        else:
+            rand = [secrets.randbelow(64) for _ in range(12)]
+        _push_last[0], _push_last[1] = now, rand
+    stamp = []
+    for _ in range(8):
+        stamp.append(PUSH_CHARS[now % 64])
+        now //= 64
+    return "".join(reversed(stamp)) + "".join(PUSH_CHARS[r] for r in rand)
+
+
+def make_backend(kind="firebase", filename=None):
+    if kind == "firebase": return FirebaseBackend()
+    if kind == "memory": return MemoryBackend(load_json_tree(filename))   # 파일은 시작 데이터로만 읽는다.
+    if kind == "json": return JsonFileBackend(filename or "local_db.json")
+    raise ValueError(f"알 수 없는 저장소 백엔드: {kind}")
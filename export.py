@@ -0,0 +1,94 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+import csv
+import hashlib
+import io
+
+from roster import roster_for
+from model import records_model
+
+# ==========================================
+# 📤 근무표 내보내기 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# 날짜 범위를 월 단위로 걸으며 달력과 같은 근무표(roster_for)로 근무 시간과 기록을 행으로 만든다.
+# 월 규칙 찾기/팀 정리/기록 읽기는 월마다 한 번이고, 행은 generator 로 하나씩 내보내므로
+# 1년 전체를 내보내도 한 달 치 schedule 만 메모리에 둔다.
+# load_month(year, month) 는 app.load_month_schedule 처럼 해당 월 schedule 모양의 dict 를 돌려준다.
+
+ExportRow = namedtuple("ExportRow", "date name kind label start end note rid")
+# kind  : 근무 / 당직 / 연차 / 시간외
+# start : "HH:MM" (시간이 정해진 근무, ICS 에서는 기기 현지 시간) 또는 "" (하루 종일 일정)
+# rid   : 기록 id (근무 행은 ""). CSV 에는 쓰지 않고 ICS UID 를 기록마다 다르게 하는 데 쓴다.
+
+SHIFT_HOURS = {"[08-17]": ("08:00", "17:00"), "[11-20]": ("11:00", "20:00"), "[09-18]": ("09:00", "18:00")}
+RECORD_KINDS = ('당직', '연차', '시간외')
+CSV_HEADER = ["날짜", "이름", "구분", "근무", "시작", "종료", "비고"]
+
+
+def iter_months(start, end):
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        yield y, m
+        m += 1
+        if m > 12: y, m = y + 1, 1
+
+def record_label(rec):
+    if rec.type == '당직': return f"당직 {rec.val}".strip()
+    if rec.type in ('연차', '시간외'):
+        return f"{rec.type} {rec.val}h" if rec.plain else f"{rec.type} ({rec.val})"
+    return rec.type
+
+# start~end (date/datetime, 양끝 포함) 의 행. member 가 있으면 그 직원만.
+def iter_export(load_month, start, end, member=None):
+    start_key, end_key = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    for y, m in iter_months(start, end):
+        sch = load_month(y, m)
+        roster = roster_for(y, m, sch)
+        model = records_model(sch.get("records", {}))
+        for day in roster.days:
+            if not start_key <= day.date_str <= end_key: continue
+            for name, lbl in day.shifts.items():
+                if member and name != member: continue
+                s, e = SHIFT_HOURS.get(lbl, ("", ""))
+                yield ExportRow(day.date_str, name, "근무", lbl, s, e, "", "")
+            for rec in model.get(day.date_str, ()):
+                if rec.type not in RECORD_KINDS or (member and rec.name != member): continue
+                yield ExportRow(day.date_str, rec.name, rec.type, record_label(rec), "", "", rec.memo if rec.type != '당직' else "", rec.id or "")
+
+
+def csv_chunks(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow(row[:len(CSV_HEADER)])
+        if buf.tell() > 64 * 1024:
+            yield buf.getvalue()
+            buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+
+def ics_text(text):
+    return str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ics_event(row, stamp):
+    key = f"{row.date}|{row.name}|{row.kind}|{row.label}" + (f"|{row.rid}" if row.rid else "")
+    uid = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    day = row.date.replace("-", "")
+    lines = ["BEGIN:VEVENT", f"UID:{uid}@yuldong", f"DTSTAMP:{stamp}"]
+    if row.start:
+        lines += [f"DTSTART:{day}T{row.start.replace(':', '')}00", f"DTEND:{day}T{row.end.replace(':', '')}00"]
+    else:
+        next_day = (datetime.strptime(row.date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y%m%d")
+        lines += [f"DTSTART;VALUE=DATE:{day}", f"DTEND;VALUE=DATE:{next_day}"]
+    lines.append(f"SUMMARY:{ics_text(f'{row.name} {row.label}')}")
+    if row.note: lines.append(f"DESCRIPTION:{ics_text(row.note)}")
+    lines.append("END:VEVENT")
+    return "".join(line + "\r\n" for line in lines)
+
+def ics_chunks(rows, cal_name="율동공원 근무표"):
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield ("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//yuldong//roster//KO\r\n"
+           f"CALSCALE:GREGORIAN\r\nX-WR-CALNAME:{ics_text(cal_name)}\r\nX-WR-TIMEZONE:Asia/Seoul\r\n")
+    for row in rows: yield ics_event(row, stamp)
+    yield "END:VCALENDAR\r\n"
@@ -0,0 +1,70 @@
+from model import record_items
+
+# ==========================================
+# 🧢 분실물 목록 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# 항목은 lost_found/{id} 에 하나씩 둔다. (예전 배열 모양이면 배열 순번이 id)
+# 색인은 lost_index 아래에 두고 항목을 쓸 때 같은 update 로 함께 고친다.
+#   kept/{id}, returned/{id} : 항목 사본 (상태별 목록, 화면은 lost_found 대신 이것을 읽는다)
+#   by_date/{등록일}/{id}    : true
+#   kept_count               : 보관중 개수 (서버 increment 로 더하고 뺀다, 없으면 전체에서 센다)
+# 오래된 수령완료 항목은 lost_archive/{수령월}/{id} 로 옮겨 lost_found 를 작게 유지한다.
+
+LOST_KEPT = "보관중"
+LOST_RETURNED = "수령완료"
+LOST_DELETING = "삭제중"   # 삭제를 차지한 뒤 지우기 전까지의 상태
+
+
+def lost_item_list(raw_lost):
+    return record_items(raw_lost)
+
+# 화면에 그릴 행 (최신 등록순): (id, 항목, 보관중 여부, 제목, 설명)
+def lost_rows(lost_items):
+    rows = []
+    for lid, item in reversed(lost_items):
+        is_kept = (item.get('status') == LOST_KEPT)
+        icon = "🟢" if is_kept else "⚪"
+        rows.append((lid, item, is_kept, f"{icon} **{item.get('item')}**", f"{item.get('location')} | {item.get('date')}"))
+    return rows
+
+def kept_count(lost_items):
+    return len([x for _, x in lost_items if x.get('status') == LOST_KEPT])
+
+# 항목 하나의 색인 경로 (lost_index 기준). remove=True 면 지우는 값(None)
+def lost_index_changes(lid, item, remove=False):
+    kind = "kept" if item.get('status') == LOST_KEPT else "returned"
+    date = item.get('date') or "-"
+    return {
+        f"{kind}/{lid}": None if remove else item,
+        f"by_date/{date}/{lid}": None if remove else True,
+    }
+
+def build_lost_index(raw_lost):
+    index = {"kept": {}, "returned": {}, "by_date": {}}
+    items = lost_item_list(raw_lost)
+    for lid, item in items:
+        for path, value in lost_index_changes(lid, item).items():
+            node = index
+            *parents, leaf = path.split("/")
+            for p in parents: node = node.setdefault(p, {})
+            node[leaf] = value
+    index["kept_count"] = kept_count(items)
+    return index
+
+# 수령일(없으면 등록일)이 cutoff(YYYY-MM-DD) 보다 이른 수령완료 항목을 보관 노드로 옮기는 update 들
+# 항목 batch 개씩 묶어 ROOT 기준 multi-path update 로 돌려준다.
+def archive_batches(raw_lost, cutoff, batch=100):
+    changes, count = {}, 0
+    for lid, item in lost_item_list(raw_lost):
+        if item.get('status') == LOST_KEPT: continue
+        ret = item.get('return_date')
+        if not ret or ret == "-": ret = item.get('date')
+        if not ret or ret >= cutoff: continue
+        changes[f"lost_archive/{ret[:7]}/{lid}"] = item
+        changes[f"lost_found/{lid}"] = None
+        changes.update({f"lost_index/{k}": v for k, v in lost_index_changes(lid, item, remove=True).items()})
+        count += 1
+        if count == batch:
+            yield changes
+            changes, count = {}, 0
+    if changes: yield changes
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+import re
+import threading
+
+# ==========================================
+# 🧾 기록 모델 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# Firebase 는 같은 노드를 dict/배열/None 으로 섞어 주고, val 은 "4", "4 (행사)", "22:00~" 같은 문자열이다.
+# 받은 스냅샷마다 한 번만 Record 로 바꿔 두고 근무표/달력/합계는 Record 만 다룬다.
+# DB 의 정식 모양 (migrate-schema 로 맞춘다):
+#   schedule/records/{날짜}/{id} = {"name", "type", "val": 문자열, "hours": 숫자 (시간외/연차만)}
+#   schedule/teams = {"1": [이름, ...], "2": [이름, ...]}
+
+HOURS_TYPES = ('시간외', '연차')
+NUMBER_RE = re.compile(r"[-+]?\d*\.\d+|\d+")
+MODEL_CACHE_SIZE = 64
+_model_cache = OrderedDict()
+_model_lock = threading.Lock()
+
+
+def normalize_data(data):
+    if isinstance(data, list): return {str(i): v for i, v in enumerate(data) if v is not None}
+    return data if data else {}
+
+# 날짜별 기록 (id, 기록) 목록. id 는 schedule/records/{날짜}/{id} 의 키다.
+# 예전 배열 모양의 날은 배열 순번("0", "1", ...)이 id 가 되고, 새 기록은 push 키를 쓴다.
+def record_id_order(rid):
+    return (0, int(rid), "") if rid.isdigit() else (1, 0, rid)
+
+def record_items(raw):
+    if not isinstance(raw, (dict, list)): return []
+    items = normalize_data(raw)
+    return [(rid, items[rid]) for rid in sorted(items, key=record_id_order) if isinstance(items[rid], dict)]
+
+
+class Record:
+    __slots__ = ("id", "name", "type", "val", "hours", "memo", "plain")
+
+    def __init__(self, rid, name, rtype, val, hours, memo, plain):
+        self.id = rid
+        self.name = name
+        self.type = rtype
+        self.val = val          # 화면에 보이는 원래 문자열
+        self.hours = hours      # 시간외/연차 시간 (그 밖의 구분은 0.0)
+        self.memo = memo        # val 에서 시간 숫자를 뺀 나머지
+        self.plain = plain      # val 이 숫자만 있는지 (달력 뱃지에 "h" 를 붙인다)
+
+    @classmethod
+    def from_raw(cls, rid, raw):
+        val = raw.get('val')
+        val = "" if val is None else str(val)
+        rtype = raw.get('type') or ""
+        hours, memo = 0.0, val
+        if rtype in HOURS_TYPES:
+            m = NUMBER_RE.search(val)
+            if m: memo = (val[:m.start()] + val[m.end():]).strip()
+            stored = raw.get('hours')
+            if isinstance(stored, (int, float)): hours = float(stored)
+            elif m: hours = float(m.group())
+        return cls(rid, raw.get('name') or "", rtype, val, hours, memo, val.replace('.', '').isdigit())
+
+    def amounts(self):
+        # 합계에 더하는 값 (시간외 시간, 연차 시간, 당직 횟수)
+        if self.type == '당직': return 0.0, 0.0, 1
+        if self.type == '시간외': return self.hours, 0.0, 0
+        if self.type == '연차': return 0.0, self.hours, 0
+        return 0.0, 0.0, 0
+
+    def to_raw(self):
+        raw = {"name": self.name, "type": self.type, "val": self.val}
+        if self.type in HOURS_TYPES: raw["hours"] = self.hours
+        return raw
+
+
+def as_record(rec, rid=None):
+    return rec if isinstance(rec, Record) else Record.from_raw(rid, rec)
+
+# 새로 쓰는 기록을 정식 모양으로 (시간은 쓸 때 한 번만 읽어 hours 에 둔다). 그 밖의 필드는 그대로 둔다.
+def canonical_record(raw):
+    return {**(raw if isinstance(raw, dict) else {}), **Record.from_raw(None, raw).to_raw()}
+
+def day_model(raw_day):
+    return tuple(Record.from_raw(rid, raw) for rid, raw in record_items(raw_day))
+
+# records 스냅샷 -> {날짜: (Record, ...)}. 캐시에서 받은 같은 스냅샷 객체면 다시 만들지 않는다. (스냅샷은 읽기 전용)
+def records_model(records):
+    key = id(records)
+    with _model_lock:
+        hit = _model_cache.get(key)
+        if hit and hit[0] is records:
+            _model_cache.move_to_end(key)
+            return hit[1]
+    model = {d_key: day_model(raw) for d_key, raw in normalize_data(records).items()}
+    with _model_lock:
+        _model_cache[key] = (records, model)
+        while len(_model_cache) > MODEL_CACHE_SIZE: _model_cache.popitem(last=False)
+    return model
+
+def clear_model_cache():
+    with _model_lock:
+        _model_cache.clear()
+
+
+def canonical_teams(teams):
+    teams = normalize_data(teams)
+    out = {}
+    for key in ("1", "2"):
+        members = teams.get(key, [])
+        if isinstance(members, str): members = [members]
+        elif isinstance(members, dict): members = list(members.values())
+        out[key] = [m for m in members if m] if isinstance(members, list) else []
+    return out
+
+def canonical_day(raw_day, new_id):
+    # 배열 순번 id 는 new_id() 로 바꾸고 기록은 정식 모양으로
+    return {(new_id() if rid.isdigit() else rid): canonical_record(raw) for rid, raw in record_items(raw_day)}
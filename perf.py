@@ -0,0 +1,134 @@
+from functools import wraps
+import json
+import threading
+import time
+
+# ==========================================
+# ⏱️ 화면 한 번 그릴 때의 성능 기록 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# 스크립트가 다시 실행될 때마다 begin() 으로 새 기록을 만들고, 그 실행 중의 단계(stage)와 경로(path)별로
+# 호출 횟수 / 걸린 시간(ms) / 대략의 데이터 크기(JSON 바이트)를 더한다.
+# 기록은 스크립트를 실행하는 스레드에 둔다. (세션마다 스레드가 따로라 섞이지 않고, 리스너 스레드는 기록하지 않는다)
+# 기록을 켜지 않았으면 current() 가 None 이라 span/traced 는 시간만 재지 않고 그대로 실행한다.
+
+_local = threading.local()
+
+
+def payload_bytes(value):
+    if value is None: return 0
+    try: return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError): return 0
+
+
+class PerfTrace:
+    __slots__ = ("started", "stats", "lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stats = {}  # (stage, path) -> [횟수, ms, 바이트]
+        self.lock = threading.Lock()  # 미리 불러오기 작업 스레드도 같은 기록에 더한다
+
+    def add(self, stage, path, ms, size=0):
+        with self.lock:
+            s = self.stats.setdefault((stage, path or ""), [0, 0.0, 0])
+            s[0] += 1; s[1] += ms; s[2] += size
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def items(self):
+        with self.lock: return [(k, list(v)) for k, v in self.stats.items()]
+
+    # 걸린 시간이 긴 순서로 [{stage, path, calls, ms, bytes}, ...]
+    def rows(self):
+        rows = [{"stage": stage, "path": path, "calls": c, "ms": round(ms, 2), "bytes": b}
+                for (stage, path), (c, ms, b) in self.items()]
+        return sorted(rows, key=lambda r: -r["ms"])
+
+    # db.* 단계 = 실제 백엔드 왕복
+    def totals(self):
+        db = [v for (stage, _), v in self.items() if stage.startswith("db.")]
+        return {"total_ms": round(self.elapsed_ms(), 2),
+                "db_calls": sum(v[0] for v in db),
+                "db_ms": round(sum(v[1] for v in db), 2),
+                "db_bytes": sum(v[2] for v in db)}
+
+    def to_json(self, **meta):
+        return json.dumps({**meta, **self.totals(), "stages": self.rows()}, ensure_ascii=False)
+
+
+def begin(enabled=True):
+    _local.trace = PerfTrace() if enabled else None
+    return _local.trace
+
+def current():
+    return getattr(_local, "trace", None)
+
+# 지금 기록을 다른 스레드에서 실행할 fn 에 이어 준다.
+def bind(fn):
+    trace = current()
+    if trace is None: return fn
+
+    @wraps(fn)
+    def inner(*args, **kwargs):
+        prev, _local.trace = current(), trace
+        try: return fn(*args, **kwargs)
+        finally: _local.trace = prev
+    return inner
+
+
+# with span("get_data", path) as sp: return sp.size(value)
+# 크기는 시간을 잰 뒤에 계산하므로 JSON 변환 시간은 ms 에 들어가지 않는다.
+class span:
+    __slots__ = ("stage", "path", "trace", "t0", "values")
+
+    def __init__(self, stage, path=None):
+        self.stage, self.path = stage, path
+
+    def __enter__(self):
+        self.trace = current()
+        self.values = []
+        self.t0 = time.perf_counter()
+        return self
+
+    def size(self, value):
+        if self.trace is not None: self.values.append(value)
+        return value
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            ms = (time.perf_counter() - self.t0) * 1000
+            self.trace.add(self.stage, self.path, ms, sum(payload_bytes(v) for v in self.values))
+        return False
+
+
+def traced(stage):
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            with span(stage): return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# 백엔드 호출 하나하나를 db.{메서드} 단계로 기록한다. (캐시/미러가 왕복을 줄였는지 여기서 확인)
+class TracedBackend:
+    READS = ("get", "get_range", "get_last")
+    WRITES = ("set", "update")
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if name not in self.READS + self.WRITES + ("transaction", "delete"): return attr
+
+        def call(path, *args, **kwargs):
+            label = f"{path} {list(args)}" if name in ("get_range", "get_last") else path
+            with span(f"db.{name}", label) as sp:
+                result = attr(path, *args, **kwargs)
+                if name in self.READS: sp.size(result)
+                elif name in self.WRITES and args: sp.size(args[0])
+                elif name == "transaction": sp.size(result[0])
+                return result
+        return call
@@ -0,0 +1,83 @@
+import io
+
+from model import records_model
+
+# ==========================================
+# 📈 기간 보고서 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# schedule/records 를 한 번 펼쳐 열 단위 표 (date, month, name, type, hours, memo, ot, leave, night) 로 만들고
+# 직원별/월별 합계는 pandas groupby/pivot 으로 한 번에 계산한다.
+# pandas 는 보고서를 만들 때만 불러온다. (설치되어 있지 않으면 load_pandas() 가 None)
+# 엑셀 파일은 openpyxl 이 있을 때만 만든다.
+
+METRICS = {"ot": "시간외(h)", "leave": "연차(h)", "night": "당직(회)"}
+FRAME_COLUMNS = ["date", "name", "type", "hours", "memo"]
+# 기록이 없어도 (빈 DB) 열 타입이 정해지도록 dtype 을 지정해 만든다.
+FRAME_DTYPES = {"date": str, "name": str, "type": str, "hours": float, "memo": str}
+
+
+def load_pandas():
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    return pd
+
+def excel_available():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# records 스냅샷 -> 열 목록 (Record 로 이미 읽은 시간을 그대로 쓴다)
+def record_columns(records):
+    cols = {c: [] for c in FRAME_COLUMNS}
+    for d_key, day in records_model(records).items():
+        for r in day:
+            if not r.name: continue
+            cols["date"].append(d_key); cols["name"].append(r.name); cols["type"].append(r.type)
+            cols["hours"].append(r.hours); cols["memo"].append(r.memo)
+    return cols
+
+def records_frame(pd, records):
+    cols = record_columns(records)
+    df = pd.DataFrame({c: pd.Series(cols[c], dtype=FRAME_DTYPES[c]) for c in FRAME_COLUMNS})
+    df["month"] = df["date"].str[:7]
+    df["ot"] = df["hours"].where(df["type"] == "시간외", 0.0)
+    df["leave"] = df["hours"].where(df["type"] == "연차", 0.0)
+    df["night"] = (df["type"] == "당직").astype(int)
+    return df.sort_values(["date", "name"], kind="stable", ignore_index=True)
+
+def period_frame(df, start_key, end_key):
+    return df[(df["date"] >= start_key) & (df["date"] <= end_key)]
+
+# 직원별 기간 합계 (시간외, 연차, 당직)
+def member_totals(df):
+    totals = df.groupby("name")[list(METRICS)].sum()
+    totals = totals[(totals != 0).any(axis=1)]
+    return totals.rename(columns=METRICS).rename_axis("이름")
+
+# 직원 × 월 표 (metric 하나)
+def member_month_pivot(df, metric):
+    pivot = df.pivot_table(index="name", columns="month", values=metric, aggfunc="sum", fill_value=0)
+    pivot = pivot[(pivot != 0).any(axis=1)]
+    return pivot.rename_axis(index="이름", columns="월")
+
+
+def report_csv(totals, pivots):
+    buf = io.StringIO()
+    totals.to_csv(buf)
+    for metric, pivot in pivots.items():
+        buf.write(f"\n{METRICS[metric]}\n")
+        pivot.to_csv(buf)
+    return buf.getvalue().encode("utf-8-sig")
+
+def report_excel(pd, totals, pivots):
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        totals.to_excel(writer, sheet_name="합계")
+        for metric, pivot in pivots.items():
+            pivot.to_excel(writer, sheet_name=METRICS[metric].split("(")[0])
+    return buf.getvalue()
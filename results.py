@@ -0,0 +1,60 @@
+from html import escape
+
+# ==========================================
+# 📊 PC 프로그램 분석 결과 화면 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# monitor_result = {"updated_at", "summary": {total, checkin, nocheck}, "zones": {구역: {"blue": [...], "green": [...]}}}
+# stay_result    = {"updated_at", "list": [문자열, ...]}
+# 항목마다 요소를 하나씩 보내면 주말처럼 수백 건일 때 휴대폰이 느려지므로, 거른 결과를 HTML 한 덩어리로 만든다.
+# 구역은 <details> 로 묶어 접고 펴기는 브라우저에서 한다.
+
+ZONE_ORDER = ["A", "B", "C", "D", "E", "F", "기타"]
+MONITOR_STATUS = {"blue": "입실", "green": "대기"}
+STAY_KINDS = {"move": "방이동", "stay": "연박"}
+
+
+def search_key(text):
+    return "".join(str(text).split()).lower()
+
+def matches(text, query):
+    return not query or search_key(query) in search_key(text)
+
+
+# (구역, 상태, 내용) 목록. 상태는 "blue"(입실) / "green"(대기)
+def monitor_cards(mon_data):
+    zones = (mon_data or {}).get("zones") or {}
+    names = [z for z in ZONE_ORDER if z in zones] + sorted(z for z in zones if z not in ZONE_ORDER)
+    cards = []
+    for z_name in names:
+        z_data = zones.get(z_name) or {}
+        for status in MONITOR_STATUS:
+            cards += [(z_name, status, text) for text in (z_data.get(status) or []) if text]
+    return cards
+
+def filter_monitor(cards, zones=None, status=None, query=""):
+    return [c for c in cards
+            if (not zones or c[0] in zones) and (not status or c[1] == status) and matches(c[2], query)]
+
+def monitor_html(cards):
+    if not cards: return "<div class='result-empty'>조건에 맞는 예약이 없습니다.</div>"
+    by_zone = {}
+    for z_name, status, text in cards: by_zone.setdefault(z_name, []).append((status, text))
+    parts = []
+    for z_name, items in by_zone.items():
+        parts.append(f"<details class='zone-box' open><summary>📍 {escape(z_name)} 구역 ({len(items)}건)</summary>")
+        parts += [f"<div class='stat-card stat-{status}'>{escape(str(text))}</div>" for status, text in items]
+        parts.append("</details>")
+    return "".join(parts)
+
+
+# (종류, 내용) 목록. 종류는 "move"(방이동) / "stay"(연박)
+def stay_rows(stay_data):
+    items = (stay_data or {}).get("list") or []
+    return [("move" if ("방이동" in item or "➡" in item) else "stay", item) for item in items if item]
+
+def filter_stay(rows, kind=None, query=""):
+    return [r for r in rows if (not kind or r[0] == kind) and matches(r[1], query)]
+
+def stay_html(rows):
+    if not rows: return "<div class='result-empty'>조건에 맞는 항목이 없습니다.</div>"
+    return "".join(f"<div class='stay-card stay-{kind}'>{escape(str(text))}</div>" for kind, text in rows)
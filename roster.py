@@ -0,0 +1,454 @@
+from collections import namedtuple, OrderedDict
+from datetime import datetime, timedelta
+import calendar
+import hashlib
+import json
+import threading
+
+from model import (normalize_data, record_items, records_model, clear_model_cache,
+                   as_record, day_model, canonical_teams)
+
+# ==========================================
+# 📅 근무표 계산 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# app.py 와 bench.py 가 함께 쓴다. 여기서는 화면에 그리지 않고 값/HTML 만 돌려준다.
+
+# 월 조회 범위: 해당 월 + 전날(당직휴무 계산용)
+def month_range_keys(year, month):
+    first = datetime(year, month, 1)
+    last_day = calendar.monthrange(year, month)[1]
+    start_key = (first - timedelta(days=1)).strftime("%Y-%m-%d")
+    end_key = f"{year}-{month:02d}-{last_day:02d}"
+    return start_key, end_key
+
+# ==========================================
+# 🧮 월 근무 엔진 (달력/자동 근무자 공용)
+# ==========================================
+# (해당 월 규칙, teams, 해당 월 records) 로 한 달 치 근무를 한 번에 계산한다.
+# 같은 입력이면 해시로 캐시된 결과를 그대로 돌려주므로 데이터가 바뀌기 전까지는 월당 한 번만 계산한다.
+# - 요일 휴무: rotation_type (fixed / biweekly / two_weeks) 에 따라 t1_off/t2_off 를 주차별로 교대
+# - 휴무 처리: 당직휴무/휴무/팀휴무 기록, 전날 당직자
+# - 특별근무: 규칙상 쉬는 날이어도 근무 ([09-18])
+
+RosterDay = namedtuple("RosterDay", "date_str weekday week_idx boxes shifts")
+# boxes  : 근무 박스 [(css 클래스, 시간 라벨, (이름, ...)), ...] (A조, B조 순서)
+# shifts : 근무자별 시간 라벨 {이름: "[08-17]"}
+
+OFF_TYPES = ['당직휴무', '휴무', '팀휴무']
+ROSTER_CACHE_SIZE = 64
+_roster_cache = OrderedDict()
+_roster_lock = threading.Lock()
+
+
+class MonthRoster:
+    __slots__ = ("year", "month", "t1", "t2", "members", "days", "matrix", "calendar")
+
+    def __init__(self, year, month, t1, t2, days):
+        self.year, self.month = year, month
+        self.t1, self.t2 = t1, t2
+        self.members = tuple(t1) + tuple(t2)
+        self.days = days                      # days[d-1] = RosterDay
+        # 일 × 직원 근무 행렬: matrix[d-1][i] = members[i] 의 시간 라벨 (쉬면 "")
+        self.matrix = tuple(tuple(day.shifts.get(m, "") for m in self.members) for day in days)
+        self.calendar = None                  # MonthCalendar (month_calendar 에서 처음 쓸 때 만든다)
+
+    def day(self, day):
+        return self.days[day - 1]
+
+    def duty_members(self, day):
+        return list(self.days[day - 1].shifts)
+
+
+def team_lists(teams):
+    teams = canonical_teams(teams)
+    return teams["1"], teams["2"]
+
+
+def week_offs(rules, r_idx):
+    base_off1 = rules.get("t1_off", []) or []
+    base_off2 = rules.get("t2_off", []) or []
+    rotation_type = rules.get("rotation_type", "fixed")
+    if rotation_type == "biweekly" and (r_idx % 2 != 0):
+        # 격주 모드 & 홀수 주차 -> 반대로
+        return base_off2, base_off1
+    if rotation_type == "two_weeks":
+        # 2주 단위 모드
+        if (r_idx // 2) % 2 == 1: return base_off2, base_off1
+    return base_off1, base_off2
+
+
+def roster_key(year, month, rules, teams, records):
+    raw = json.dumps([year, month, rules, teams, records], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def month_roster(year, month, rules, teams, records):
+    key = roster_key(year, month, rules, teams, records)
+    with _roster_lock:
+        if key in _roster_cache:
+            _roster_cache.move_to_end(key)
+            return _roster_cache[key]
+    model = {d_key: day_model(raw) for d_key, raw in normalize_data(records).items()}
+    roster = compute_month_roster(year, month, rules or {}, teams, model)
+    with _roster_lock:
+        _roster_cache[key] = roster
+        while len(_roster_cache) > ROSTER_CACHE_SIZE: _roster_cache.popitem(last=False)
+    return roster
+
+
+def clear_roster_cache():
+    with _roster_lock:
+        _roster_cache.clear()
+        _identity_cache.clear()
+        _calendar_html_cache.clear()
+    clear_model_cache()
+
+
+def compute_month_roster(year, month, rules, teams, records):
+    t1_list, t2_list = team_lists(teams)
+    start_team = rules.get("start_team", "1")
+    time_type = rules.get("time_type", "split")
+
+    days = []
+    prev_str = month_range_keys(year, month)[0]
+    for r_idx, week in enumerate(calendar.Calendar(firstweekday=0).monthdayscalendar(year, month)):
+        curr_off1, curr_off2 = week_offs(rules, r_idx)
+        # A조/B조 순서 결정: start_team 이 1이면 짝수주에 1조가 A(먼저)
+        is_even_week = (r_idx % 2 == 0)
+        is_t1_first = (start_team == "1") if is_even_week else (start_team == "2")
+
+        for c_idx, day in enumerate(week):
+            if day == 0: continue
+            date_str = f"{year}-{month:02d}-{day:02d}"
+
+            off_names = {r.name for r in records.get(prev_str, ()) if r.type == '당직'}
+            special_names = set()
+            for r in records.get(date_str, ()):
+                if r.type in OFF_TYPES: off_names.add(r.name)
+                elif r.type == '특별근무': special_names.add(r.name)
+            prev_str = date_str
+
+            # 규칙상 근무 여부 + 최종 근무자 명단 (특별근무자 포함)
+            is_t1_rule_work = (c_idx not in curr_off1)
+            is_t2_rule_work = (c_idx not in curr_off2)
+            t1_today = [m for m in t1_list if (is_t1_rule_work and m not in off_names) or (m in special_names)]
+            t2_today = [m for m in t2_list if (is_t2_rule_work and m not in off_names) or (m in special_names)]
+
+            boxes, shifts = [], {}
+            for css, names, is_rule, rule_lbl in [
+                ("wb-a", t1_today if is_t1_first else t2_today, is_t1_rule_work if is_t1_first else is_t2_rule_work, "[08-17]"),
+                ("wb-b", t2_today if is_t1_first else t1_today, is_t2_rule_work if is_t1_first else is_t1_rule_work, "[11-20]"),
+            ]:
+                if not names: continue
+                # 규칙상 휴무인데 나옴(특별근무) 또는 통합 근무 설정이면 [09-18]
+                lbl = "[09-18]" if (not is_rule or time_type == "unified") else rule_lbl
+                boxes.append((css, lbl, tuple(names)))
+                for m in names: shifts.setdefault(m, lbl)
+
+            days.append(RosterDay(date_str, c_idx, r_idx, tuple(boxes), shifts))
+    return MonthRoster(year, month, t1_list, t2_list, tuple(days))
+
+
+# schedule 모양의 dict (전체 또는 load_month_schedule 결과) 에서 해당 월 근무표를 얻는다.
+# 캐시에서 받은 같은 스냅샷 객체로 다시 부르면 해시 계산 없이 바로 돌려준다. (스냅샷은 읽기 전용)
+_identity_cache = OrderedDict()
+
+def roster_for(year, month, sch_data):
+    raw_records = sch_data.get("records", {})
+    teams = sch_data.get("teams", {})
+    rules = normalize_data(sch_data.get("month_rules", {})).get(f"{year}-{month:02d}", {}) or {}
+
+    ident = (year, month, id(raw_records), id(teams), id(rules))
+    hit = _identity_cache.get(ident)
+    if hit and hit[0] is raw_records and hit[1] is teams and hit[2] is rules: return hit[3]
+
+    records = normalize_data(raw_records)
+    start_key, end_key = month_range_keys(year, month)
+    month_recs = {k: v for k, v in records.items() if start_key <= k <= end_key}
+    roster = month_roster(year, month, rules, teams, month_recs)
+    with _roster_lock:
+        _identity_cache[ident] = (raw_records, teams, rules, roster)
+        while len(_identity_cache) > ROSTER_CACHE_SIZE: _identity_cache.popitem(last=False)
+    return roster
+
+# --- 자동 근무자 계산 함수 ---
+def get_auto_duty_members(curr_date, sch_data):
+    return roster_for(curr_date.year, curr_date.month, sch_data).duty_members(curr_date.day)
+
+# ==========================================
+# 🗓️ 월 규칙 일괄 계획 (schedule/month_rules)
+# ==========================================
+# 한 가지 교대 패턴을 시작 월부터 N 개월 앞으로 펼친다. 미리보기는 month_roster 로 계산하므로
+# 같은 (규칙, teams, records) 이면 캐시된 근무표를 그대로 쓴다.
+ROTATION_TYPES = {"fixed": "고정", "biweekly": "격주 교대", "two_weeks": "2주 단위 교대"}
+TIME_TYPES = {"split": "조별 (08-17 / 11-20)", "unified": "통합 (09-18)"}
+SHIFT_MARKS = {"[08-17]": ("8", "#e7f5ff"), "[11-20]": ("11", "#fff4e6"), "[09-18]": ("9", "#f3f0ff")}
+
+def plan_month_rules(year, month, months, start_team="1", t1_off=(), t2_off=(), rotation_type="fixed",
+                     time_type="split", alternate_team=True, alternate_off=False):
+    # alternate_team: 달마다 시작 팀을 바꾼다 / alternate_off: 달마다 1조/2조 휴무 요일을 맞바꾼다
+    plan = {}
+    for i in range(months):
+        y, m = divmod(month - 1 + i, 12)
+        y, m = year + y, m + 1
+        flip_team = alternate_team and i % 2 == 1
+        flip_off = alternate_off and i % 2 == 1
+        plan[f"{y}-{m:02d}"] = {
+            "start_team": ("2" if start_team == "1" else "1") if flip_team else start_team,
+            "t1_off": sorted(t2_off if flip_off else t1_off),
+            "t2_off": sorted(t1_off if flip_off else t2_off),
+            "rotation_type": rotation_type,
+            "time_type": time_type,
+        }
+    return plan
+
+# 근무표 미리보기: 직원 × 일 표 (8 = 08-17, 11 = 11-20, 9 = 09-18, · = 휴무)
+def roster_matrix_html(roster):
+    head = ['<th></th>']
+    for day in roster.days:
+        color = "#1c7ed6" if day.weekday == 5 else "#e03131" if day.weekday == 6 else "#495057"
+        head.append(f'<th style="color:{color};font-weight:normal">{int(day.date_str[-2:])}</th>')
+    rows = []
+    for i, name in enumerate(roster.members):
+        cells = [f'<th style="text-align:left;white-space:nowrap">{name}</th>']
+        for day_row in roster.matrix:
+            mark, bg = SHIFT_MARKS.get(day_row[i], ("·", "#fff"))
+            cells.append(f'<td style="background:{bg};text-align:center">{mark}</td>')
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    return ('<div style="overflow-x:auto"><table style="border-collapse:collapse;font-size:0.65rem">'
+            f'<tr>{"".join(head)}</tr>{"".join(rows)}</table></div>')
+
+# --- 기간 일괄 입력 날짜 ---
+# start~end (양 끝 포함) 중 weekdays(0=월 ... 6=일, None 이면 전부) 에 드는 날짜 키.
+# work_name 을 주면 month_schedule(연, 월) 로 받은 그 달 근무표에서 그 직원이 근무하지 않는 날은 뺀다.
+MAX_BATCH_DAYS = 93
+
+def batch_dates(start, end, weekdays=None, work_name=None, month_schedule=None):
+    if end < start: return []
+    if (end - start).days + 1 > MAX_BATCH_DAYS:
+        raise ValueError(f"기간은 최대 {MAX_BATCH_DAYS}일까지 입력할 수 있습니다.")
+    rosters, keys = {}, []
+    d = start
+    while d <= end:
+        if weekdays is None or d.weekday() in weekdays:
+            if work_name:
+                ym = (d.year, d.month)
+                if ym not in rosters: rosters[ym] = roster_for(d.year, d.month, month_schedule(*ym))
+                if work_name not in rosters[ym].day(d.day).shifts:
+                    d += timedelta(days=1)
+                    continue
+            keys.append(d.strftime("%Y-%m-%d"))
+        d += timedelta(days=1)
+    return keys
+
+# ==========================================
+# 🗓️ 달력 HTML
+# ==========================================
+# 필터와 상관없는 부분(칸마다 근무 박스 HTML, 뱃지 HTML)은 MonthCalendar 로 한 번만 만들고,
+# 직원별 보기는 뱃지만 이름으로 골라 이어 붙인다. 근무표(MonthRoster)는 그 달 records 내용의 해시로
+# 캐시되므로 같은 근무표 객체에 달력 조각을 붙여 두면 데이터가 바뀌기 전까지 다시 만들지 않는다.
+
+WEEKDAY_LABELS = ['월', '화', '수', '목', '금', '토', '일']
+CAL_HEADER = ('<div class="cal-container"><div class="cal-header-row">'
+              + "".join(f'<div class="cal-header-item">{d}</div>' for d in WEEKDAY_LABELS)
+              + '</div><div class="cal-grid">')
+CAL_FOOTER = '</div></div>'
+CAL_EMPTY_CELL = '<div class="cal-cell empty"></div>'
+CALENDAR_CACHE_SIZE = 128
+_calendar_html_cache = OrderedDict()
+
+# 개인 일정 뱃지 (휴무류와 특별근무는 표시하지 않는다. 특별근무는 근무 박스에 들어 있다)
+def record_badge(rec):
+    e_type, e_name, e_val = rec.type, rec.name, rec.val
+    if e_type in OFF_TYPES or e_type == "특별근무": return None
+
+    bg_c, fg_c = "#eee", "black"
+    display_txt = f"{e_name} {e_type}"
+
+    if e_type == "당직": 
+        bg_c, fg_c = "#D32F2F", "white"
+        display_txt = f"{e_name} 당직"
+    elif e_type == "연차": 
+        bg_c, fg_c = "#2E7D32", "white"
+        if rec.plain: display_txt = f"{e_name} 연차 {e_val}h"
+        else: display_txt = f"{e_name} 연차"
+    elif e_type == "시간외": 
+        bg_c, fg_c = "#1A237E", "white"
+        if rec.plain: display_txt = f"{e_name} 시간외 {e_val}h"
+        else: display_txt = f"{e_name} 시간외 {e_val}"
+
+    return f'<div class="badge" style="background-color:{bg_c}; color:{fg_c};">{display_txt}</div>'
+
+
+class MonthCalendar:
+    __slots__ = ("cells",)
+
+    def __init__(self, cells):
+        # cells: 달력 칸 순서대로 None(빈 칸) 또는 (일, 근무 박스 HTML, ((이름, 뱃지 HTML), ...))
+        self.cells = cells
+
+    def html(self, my_filter=None):
+        show_all = not my_filter or my_filter == "전체 보기"
+        parts = [CAL_HEADER]
+        for cell in self.cells:
+            if cell is None:
+                parts.append(CAL_EMPTY_CELL)
+                continue
+            day, work_html, badges = cell
+            parts.append(f'<div class="cal-cell"><div class="date-num">{day}</div>{work_html}')
+            parts.extend(badge for name, badge in badges if show_all or name == my_filter)
+            parts.append('</div>')
+        parts.append(CAL_FOOTER)
+        return "".join(parts)
+
+
+def build_month_calendar(roster, model):
+    year, month = roster.year, roster.month
+    cells = []
+    for week in calendar.Calendar(firstweekday=0).monthdayscalendar(year, month):
+        for day in week:
+            if day == 0:
+                cells.append(None)
+                continue
+            # 근무 박스 (근무 엔진 결과), 근무자가 아무도 없으면 휴무 표시
+            boxes = roster.day(day).boxes
+            work_html = "".join(f'<div class="work-box {css}">{lbl} {", ".join(names)}</div>' for css, lbl, names in boxes)
+            if not boxes: work_html = '<div class="work-box wb-rest">휴무</div>'
+
+            badges = []
+            for rec in model.get(f"{year}-{month:02d}-{day:02d}", ()):
+                badge = record_badge(rec)
+                if badge: badges.append((rec.name, badge))
+            cells.append((day, work_html, tuple(badges)))
+    return MonthCalendar(tuple(cells))
+
+
+def month_calendar(year, month, sch_data):
+    roster = roster_for(year, month, sch_data)
+    if roster.calendar is None:
+        roster.calendar = build_month_calendar(roster, records_model(sch_data.get("records", {})))
+    return roster.calendar
+
+
+def build_calendar_html(year, month, sch_data, my_filter=None):
+    return month_calendar(year, month, sch_data).html(my_filter)
+
+
+# 완성된 HTML 을 (연, 월, 필터, 데이터 버전) 으로 캐시한다. version 이 None 이면 캐시하지 않는다.
+def cached_calendar_html(year, month, sch_data, my_filter, version):
+    if version is None: return build_calendar_html(year, month, sch_data, my_filter)
+    key = (year, month, my_filter, version)
+    with _roster_lock:
+        if key in _calendar_html_cache:
+            _calendar_html_cache.move_to_end(key)
+            return _calendar_html_cache[key]
+    html = build_calendar_html(year, month, sch_data, my_filter)
+    with _roster_lock:
+        _calendar_html_cache[key] = html
+        while len(_calendar_html_cache) > CALENDAR_CACHE_SIZE: _calendar_html_cache.popitem(last=False)
+    return html
+
+# --- 월별 개인 합계 (시간외/연차/당직) ---
+def monthly_totals(recs, sel_name, month_prefix):
+    sum_ot, sum_leave, cnt_night = 0.0, 0.0, 0
+    for d_key, day in records_model(recs).items():
+        if not d_key.startswith(month_prefix): continue  # 전날(전월 말일) 기록 제외
+        for r in day:
+            if r.name == sel_name:
+                ot, leave, night = r.amounts()
+                sum_ot += ot; sum_leave += leave; cnt_night += night
+    return sum_ot, sum_leave, cnt_night
+
+# ==========================================
+# 📊 월별 합계 노드 (schedule/summary/{YYYY-MM}/{이름})
+# ==========================================
+# {"ot": 시간외 시간, "leave": 연차 시간, "night": 당직 횟수}
+# 기록을 추가/삭제하는 쓰기와 같은 update 로 함께 고치고, 어긋나면 build_summary 로 다시 만든다.
+# 트랜잭션으로 고치므로 값이 모두 0 이 되어도 지우지 않고 0 으로 둔다. (Firebase 트랜잭션은 None 을 쓸 수 없다)
+# 그 달 records 전체로 만든 달 노드에만 SUMMARY_BUILT 표시가 있다. 표시가 없는 달은 예전 기록이 빠져 있을 수 있으므로
+# 읽을 때는 records 로 계산하고, 쓸 때는 변화량을 더하지 않고 달 전체를 다시 만든다.
+SUMMARY_BUILT = "_built"
+
+def summary_delta(added=(), removed=()):
+    # 추가/삭제된 기록 -> {이름: (시간외, 연차, 당직)} 변화량
+    delta = {}
+    for sign, recs in [(1, added), (-1, removed)]:
+        for e in recs:
+            r = as_record(e)
+            if not r.name: continue
+            ot, leave, night = r.amounts()
+            if not (ot or leave or night): continue
+            d = delta.get(r.name, (0.0, 0.0, 0))
+            delta[r.name] = (d[0] + sign * ot, d[1] + sign * leave, d[2] + sign * night)
+    return delta
+
+def summary_values(node):
+    node = node if isinstance(node, dict) else {}
+    return float(node.get("ot", 0) or 0), float(node.get("leave", 0) or 0), int(node.get("night", 0) or 0)
+
+def summary_built(month_node):
+    return isinstance(month_node, dict) and month_node.get(SUMMARY_BUILT) is True
+
+def summary_node(ot, leave, night):
+    return {"ot": round(ot, 2), "leave": round(leave, 2), "night": night}
+
+def apply_summary_delta(node, delta):
+    ot, leave, night = summary_values(node)
+    return summary_node(ot + delta[0], leave + delta[1], night + delta[2])
+
+def build_summary(records):
+    # records 전체에서 월별/직원별 합계를 새로 계산한다. (재계산 명령용)
+    totals = {}
+    for d_key, day in records_model(records).items():
+        month = totals.setdefault(d_key[:7], {})
+        for name, d in summary_delta(added=day).items():
+            month[name] = tuple(a + b for a, b in zip(month.get(name, (0.0, 0.0, 0)), d))
+    summary = {}
+    for month_key, members in totals.items():
+        nodes = {name: summary_node(*vals) for name, vals in members.items()}
+        summary[month_key] = {**{k: v for k, v in nodes.items() if any(v.values())}, SUMMARY_BUILT: True}
+    return summary
+
+# 한 달 합계 노드 (records 는 그 달을 포함하는 범위면 된다)
+def month_summary(records, month_key):
+    return build_summary(records).get(month_key) or {SUMMARY_BUILT: True}
+
+# ==========================================
+# 🗂️ 직원별 기록 색인 (schedule/member_index/{이름}/{YYYY-MM-DD}/{id})
+# ==========================================
+# 날짜마다 그 직원의 기록 {"type", "val"} 을 records 와 같은 id 로 둔다. 키가 날짜라서 최근 N 일은
+# order_by_key().limit_to_last(N) 로 바로 받고, 더 오래된 기록은 end_at(앞 페이지 첫날의 전날) 로 넘긴다.
+# 기록을 쓰거나 지울 때 같은 update 로 색인 항목도 쓰거나 지운다.
+
+def member_ref(rec):
+    r = as_record(rec)
+    return {"type": r.type, "val": r.val}
+
+def build_member_index(records):
+    index = {}
+    for d_key, day in records_model(records).items():
+        for r in day:
+            if not r.name: continue
+            index.setdefault(r.name, {}).setdefault(d_key, {})[r.id] = member_ref(r)
+    return index
+
+# 색인 한 페이지 {날짜: {id: 기록}} -> member_logs 와 같은 모양 (최신순)
+def index_logs(page):
+    logs = []
+    for d_key in sorted(page, reverse=True):
+        for rid, e in record_items(page[d_key]):
+            logs.append({**e, 'date': d_key, 'id': rid})
+    return logs
+
+def prev_date_key(d_key):
+    return (datetime.strptime(d_key, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+
+# --- 개인 기록 목록 (최신순) ---
+def member_logs(all_recs, sel_name):
+    my_logs = []
+    for d_key, day in records_model(all_recs).items():
+        for r in day:
+            if r.name == sel_name:
+                my_logs.append({'name': r.name, 'type': r.type, 'val': r.val, 'date': d_key, 'id': r.id})
+    my_logs.sort(key=lambda x: x['date'], reverse=True)
+    return my_logs
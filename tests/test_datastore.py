@@ -0,0 +1,129 @@
+import pytest
+
+from datastore import (SnapshotCache, MemoryBackend, TransactionAborted, key_range, last_keys, overlay_read,
+                       server_increment, new_push_id)
+
+
+# --- 키 순서 (order_by_key) ---
+def test_key_range_orders_integer_keys_numerically_before_strings():
+    node = {k: 1 for k in ["10", "9", "-Nabc", "2", "a"]}
+    assert list(key_range(node)) == ["2", "9", "10", "-Nabc", "a"]
+
+def test_key_range_bounds_use_firebase_order():
+    node = {str(i): i for i in range(12)}
+    assert list(key_range(node, "8", "10")) == ["8", "9", "10"]
+
+def test_last_keys_pages_numeric_ids():
+    node = {str(i): i for i in range(12)}
+    assert list(last_keys(node, 3)) == ["9", "10", "11"]
+    assert list(last_keys(node, 3, "9")) == ["7", "8", "9"]
+    assert last_keys(node, 0) == {}
+
+def test_last_keys_puts_push_ids_after_legacy_numbers():
+    node = {"11": 1, "2": 1, new_push_id(): 1}
+    assert list(last_keys(node, 2))[0] == "11"
+
+
+# --- SnapshotCache.patch ---
+def loaded(cache, path, data, **kw):
+    cache.get(path, lambda: data, **kw)
+    return cache
+
+def test_patch_range_entry_inside_range():
+    cache = loaded(SnapshotCache(), "r", {"2026-10-01": {"a": 1}}, start="2026-10-01", end="2026-10-31")
+    cache.patch("r", {"2026-10-02/b": 2})
+    assert cache.get("r", None, start="2026-10-01", end="2026-10-31") == {"2026-10-01": {"a": 1}, "2026-10-02": {"b": 2}}
+
+def test_patch_range_entry_ignores_write_outside_range():
+    cache = loaded(SnapshotCache(), "r", {"2026-10-01": {"a": 1}}, start="2026-10-01", end="2026-10-31")
+    version = cache.entry_version("r", "2026-10-01", "2026-10-31")
+    cache.patch("r", {"2026-11-01/b": 2})
+    assert cache.entry_version("r", "2026-10-01", "2026-10-31") == version
+
+def test_patch_ancestor_write_is_cut_to_range():
+    cache = loaded(SnapshotCache(), "p/r", {}, start="2", end="3")
+    cache.patch("p", {"r": {"1": "x", "2": "y", "3": "z", "4": "w"}})
+    assert cache.get("p/r", None, start="2", end="3") == {"2": "y", "3": "z"}
+
+def test_patch_drops_limit_entry():
+    cache = loaded(SnapshotCache(), "r", {"1": 1}, limit=1)
+    cache.patch("r", {"2": 2})
+    assert not cache.is_fresh("r", limit=1)
+
+def test_patch_root_entry_keeps_siblings():
+    cache = loaded(SnapshotCache(), "", {"a": {"b": 1}, "c": 2})
+    cache.patch("a", {"b": 5, "d": 6})
+    assert cache.get("", None) == {"a": {"b": 5, "d": 6}, "c": 2}
+
+def test_patch_delete_and_descendant_entry():
+    cache = loaded(SnapshotCache(), "a/b", 1)
+    loaded(cache, "a", {"b": 1, "c": 2})
+    cache.patch("", {"a/b": None})
+    assert cache.get("a/b", None) is None
+    assert cache.get("a", None) == {"c": 2}
+
+def test_patch_does_not_touch_cached_object():
+    data = {"x": {"y": 1}}
+    cache = loaded(SnapshotCache(), "n", data)
+    cache.patch("n", {"x/y": 2})
+    assert data == {"x": {"y": 1}}
+
+def test_patch_drops_entries_for_server_values():
+    cache = loaded(SnapshotCache(), "cnt", 3)
+    cache.patch("", {"cnt": server_increment(1)})
+    assert not cache.is_fresh("cnt")
+
+def test_overlay_read_refills_limit_page():
+    page = {"1": "a", "2": "b"}
+    assert overlay_read(("r", None, None, 2), page, {"r/3": "c"}) == {"2": "b", "3": "c"}
+    assert overlay_read(("r", None, None, 2), page, {"r/2": None}) == {"1": "a"}
+    assert overlay_read(("other", None, None, None), 7, {"r/2": None}) == 7
+
+
+# --- MemoryBackend ---
+def backend(tree=None):
+    return MemoryBackend({"yuldong_data": tree or {}})
+
+def test_transaction_rejects_none_like_firebase():
+    b = backend({"x": {"a": 1}})
+    with pytest.raises(ValueError):
+        b.transaction("x", lambda current: None)
+    assert b.get("x") == {"a": 1}
+
+def test_transaction_retries_after_concurrent_write():
+    b = backend({"n": 1})
+    calls = []
+    def fn(current):
+        calls.append(current)
+        if len(calls) == 1: b.set("n", 10)
+        return current + 1
+    assert b.transaction("n", fn) == (11, 1)
+    assert calls == [1, 10]
+
+def test_transaction_aborts_after_max_retries():
+    b = backend({"n": 1})
+    def fn(current):
+        b.set("n", current + 1)
+        return current
+    with pytest.raises(TransactionAborted):
+        b.transaction("n", fn)
+
+def test_update_resolves_increment():
+    b = backend({"lost_index": {"kept_count": 3}})
+    b.update("", {"lost_index/kept_count": server_increment(-1), "lost_found/x": {"item": "우산"}})
+    assert b.get("lost_index/kept_count") == 2
+    b.update("lost_index", {"missing": server_increment(2)})
+    assert b.get("lost_index/missing") == 2
+
+def test_update_emits_resolved_increment_and_deletes_none():
+    b = backend({"c": 1, "d": {"x": 1}})
+    events = []
+    b.listen(events.append)
+    b.update("", {"c": server_increment(4), "d/x": None})
+    assert events[-1].event_type == "patch"
+    assert events[-1].data == {"c": 5, "d/x": None}
+    assert b.get("d") is None
+
+def test_new_push_ids_are_increasing():
+    ids = [new_push_id() for _ in range(200)]
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
@@ -0,0 +1,29 @@
+from model import Record, canonical_record
+
+
+def test_plain_hours():
+    r = Record.from_raw("a", {"name": "김", "type": "시간외", "val": "4"})
+    assert (r.hours, r.memo, r.plain) == (4.0, "", True)
+    assert r.amounts() == (4.0, 0.0, 0)
+
+def test_hours_with_memo():
+    r = Record.from_raw("a", {"name": "김", "type": "연차", "val": "2.5 (병원)"})
+    assert (r.hours, r.memo, r.plain) == (2.5, "(병원)", False)
+    assert r.amounts() == (0.0, 2.5, 0)
+
+def test_stored_hours_win_over_val():
+    r = Record.from_raw("a", {"type": "시간외", "val": "4 (행사)", "hours": 3})
+    assert r.hours == 3.0
+
+def test_text_only_val_has_no_hours():
+    r = Record.from_raw("a", {"type": "시간외", "val": "행사"})
+    assert (r.hours, r.memo) == (0.0, "행사")
+
+def test_non_hours_types():
+    night = Record.from_raw("a", {"name": "김", "type": "당직", "val": "22:00~"})
+    assert (night.hours, night.amounts()) == (0.0, (0.0, 0.0, 1))
+    assert Record.from_raw("a", {"type": "휴무", "val": None}).val == ""
+
+def test_canonical_record_keeps_extra_fields():
+    rec = canonical_record({"name": "김", "type": "시간외", "val": "3", "by": "pc"})
+    assert rec == {"name": "김", "type": "시간외", "val": "3", "hours": 3.0, "by": "pc"}
@@ -0,0 +1,23 @@
+import pytest
+
+import report
+
+pd = pytest.importorskip("pandas")
+
+
+def test_records_frame_empty():
+    df = report.records_frame(pd, {})
+    assert df.empty
+    assert {"month", "ot", "leave", "night"} <= set(df.columns)
+    assert report.member_totals(df).empty
+
+def test_records_frame_totals():
+    records = {
+        "2026-10-01": {"a": {"name": "김", "type": "시간외", "val": "3"}, "b": {"name": "이", "type": "당직", "val": ""}},
+        "2026-11-02": {"c": {"name": "김", "type": "연차", "val": "8"}},
+    }
+    df = report.records_frame(pd, records)
+    totals = report.member_totals(df)
+    assert totals.loc["김"].tolist() == [3.0, 8.0, 0]
+    assert totals.loc["이"].tolist() == [0.0, 0.0, 1]
+    assert list(report.member_month_pivot(df, "ot").columns) == ["2026-10", "2026-11"]
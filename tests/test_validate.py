@@ -0,0 +1,65 @@
+import pytest
+
+from roster import roster_for
+from validate import load_status, check_entries, split_issues
+
+# 1조 김은 토/일, 2조 이는 월/화 휴무
+SCHEDULE = {
+    "teams": {"1": ["김"], "2": ["이"]},
+    "month_rules": {"2026-10": {"start_team": "1", "t1_off": [5, 6], "t2_off": [0, 1]}},
+    "records": {},
+}
+
+
+def schedule(records=None):
+    return {**SCHEDULE, "records": records or {}}
+
+def day_where(sch, works):
+    # 김이 근무(works=True)/휴무하는 첫 날
+    for day in roster_for(2026, 10, sch).days:
+        if ("김" in day.shifts) == works: return day.date_str
+    pytest.fail("no such day")
+
+def check(sch, d_key, name, rtype, val):
+    return load_status(lambda y, m: sch, 2026, 10).check(d_key, name, rtype, val)
+
+
+def test_leave_on_work_day_is_ok():
+    sch = schedule()
+    assert check(sch, day_where(sch, True), "김", "연차", "8") == []
+
+def test_leave_on_rule_off_day_is_error():
+    sch = schedule()
+    issues = check(sch, day_where(sch, False), "김", "연차", "8")
+    assert [i.level for i in issues] == ["error"]
+
+def test_second_night_duty_is_error():
+    sch = schedule()
+    d = day_where(sch, True)
+    sch = schedule({d: {"r1": {"name": "이", "type": "당직", "val": "22:00~"}}})
+    issues = check(sch, d, "김", "당직", "22:00~")
+    assert issues[0].level == "error" and "이" in issues[0].message
+
+def test_duplicate_record_is_error():
+    sch = schedule()
+    d = day_where(sch, True)
+    sch = schedule({d: {"r1": {"name": "김", "type": "시간외", "val": "2"}}})
+    assert [i.level for i in check(sch, d, "김", "시간외", "2")] == ["error"]
+    assert check(sch, d, "김", "시간외", "3") == []
+
+def test_overtime_off_roster_is_warning():
+    sch = schedule()
+    assert [i.level for i in check(sch, day_where(sch, False), "김", "시간외", "2")] == ["warn"]
+
+def test_audit_does_not_flag_record_against_itself():
+    sch = schedule()
+    d = day_where(sch, True)
+    sch = schedule({d: {"r1": {"name": "김", "type": "연차", "val": "8"}}})
+    assert load_status(lambda y, m: sch, 2026, 10).audit() == []
+
+def test_check_entries_splits_errors_and_warnings():
+    sch = schedule()
+    entries = [(day_where(sch, False), {"name": "김", "type": "연차", "val": "8"}),
+               (day_where(sch, False), {"name": "김", "type": "시간외", "val": 2})]
+    errors, warns = split_issues(check_entries(lambda y, m: sch, entries))
+    assert len(errors) == 1 and len(warns) == 1
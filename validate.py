@@ -0,0 +1,98 @@
+from collections import namedtuple, OrderedDict
+import threading
+
+from roster import roster_for, OFF_TYPES
+from model import records_model
+from export import iter_months
+
+# ==========================================
+# 🔎 기록 충돌 점검 (Streamlit 없이 쓰는 순수 함수)
+# ==========================================
+# 한 달 근무표(규칙/teams/기록으로 계산한 MonthRoster)와 기록으로 (날짜, 직원) -> 상태 색인을 한 번 만들고
+# 새 기록 점검과 월 전체 점검은 모두 이 색인을 찾아보기만 한다.
+#   error : 저장하지 않는다 (같은 밤 당직 두 명, 쉬는 날/제외된 날 연차, 같은 기록 중복)
+#   warn  : 저장은 하되 알린다 (근무표에 없는 날 시간외, 같은 날 연차 두 번)
+
+Issue = namedtuple("Issue", "date name level message")
+STATUS_CACHE_SIZE = 64
+_status_cache = OrderedDict()
+_status_lock = threading.Lock()
+
+
+class MonthStatus:
+    __slots__ = ("shifts", "entries", "nights")
+
+    def __init__(self, roster, model):
+        self.shifts = {}    # (날짜, 이름) -> 시간 라벨 (근무표상 쉬면 없음)
+        self.entries = {}   # (날짜, 이름) -> [(id, 구분, 내용), ...]
+        self.nights = {}    # 날짜 -> [(id, 이름), ...] 당직
+        for day in roster.days:
+            for name, lbl in day.shifts.items(): self.shifts[(day.date_str, name)] = lbl
+            for r in model.get(day.date_str, ()):
+                if not r.name: continue
+                self.entries.setdefault((day.date_str, r.name), []).append((r.id, r.type, r.val))
+                if r.type == '당직': self.nights.setdefault(day.date_str, []).append((r.id, r.name))
+
+    # 기록 하나를 이 달 색인에 비추어 점검한다. rid 를 주면 그 기록 자신은 빼고 본다. (월 점검용)
+    def check(self, d_key, name, rtype, val, rid=None):
+        issues = []
+        others = [e for e in self.entries.get((d_key, name), ()) if e[0] != rid]
+        other_types = {t for _, t, _ in others}
+        issue = lambda level, msg: issues.append(Issue(d_key, name, level, msg))
+
+        if any(t == rtype and v == val for _, t, v in others): issue("error", f"같은 {rtype} 기록이 이미 있습니다.")
+        if rtype == '당직':
+            nights = [n for i, n in self.nights.get(d_key, ()) if i != rid]
+            if nights: issue("error", f"이미 당직자가 있습니다: {', '.join(nights)}")
+        elif rtype == '연차':
+            off = sorted(other_types & set(OFF_TYPES))
+            if off: issue("error", f"이미 {'/'.join(off)} 처리된 날입니다.")
+            elif (d_key, name) not in self.shifts: issue("error", "근무표상 쉬는 날입니다.")
+            elif '연차' in other_types: issue("warn", "같은 날 연차 기록이 이미 있습니다.")
+        elif rtype == '시간외':
+            if (d_key, name) not in self.shifts and not other_types & {'당직', '특별근무'}:
+                issue("warn", "근무표에 없는 날의 시간외입니다.")
+        return issues
+
+    def audit(self):
+        issues = []
+        for (d_key, name), entries in sorted(self.entries.items()):
+            for rid, rtype, val in entries: issues += self.check(d_key, name, rtype, val, rid)
+        return issues
+
+
+# 캐시에서 받은 같은 근무표/기록 객체면 색인을 다시 만들지 않는다.
+def month_status(roster, model):
+    key = (id(roster), id(model))
+    with _status_lock:
+        hit = _status_cache.get(key)
+        if hit and hit[0] is roster and hit[1] is model: return hit[2]
+    status = MonthStatus(roster, model)
+    with _status_lock:
+        _status_cache[key] = (roster, model, status)
+        while len(_status_cache) > STATUS_CACHE_SIZE: _status_cache.popitem(last=False)
+    return status
+
+def load_status(load_month, year, month):
+    sch = load_month(year, month)
+    return month_status(roster_for(year, month, sch), records_model(sch.get("records", {})))
+
+
+# 저장 전 점검: entries = [(날짜 키, 기록 dict), ...]
+def check_entries(load_month, entries):
+    issues, statuses = [], {}
+    for d_key, rec in entries:
+        ym = (int(d_key[:4]), int(d_key[5:7]))
+        if ym not in statuses: statuses[ym] = load_status(load_month, *ym)
+        val = rec.get('val')
+        issues += statuses[ym].check(d_key, rec.get('name') or "", rec.get('type') or "", "" if val is None else str(val))
+    return issues
+
+# start~end (date/datetime) 에 걸친 달 전체 점검
+def audit_months(load_month, start, end):
+    issues = []
+    for y, m in iter_months(start, end): issues += load_status(load_month, y, m).audit()
+    return issues
+
+def split_issues(issues):
+    return [i for i in issues if i.level == "error"], [i for i in issues if i.level != "error"]